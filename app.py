@@ -8,22 +8,39 @@ A professional web application for creating personalized Valentine's Day experie
 """
 
 import os
+import re
+import io
+import csv
+import hmac
 import sqlite3
 import secrets
 import string
 import logging
+import threading
+import time
 import mimetypes
-from datetime import datetime, timedelta
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_from_directory, abort
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, send_from_directory, abort, stream_with_context
 
-from werkzeug.exceptions import RequestEntityTooLarge
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from werkzeug.sansio.multipart import MultipartDecoder, Field, File, Data, Epilogue, NeedData
 from werkzeug.utils import secure_filename
 import traceback
+import base64
 import hashlib
+import html
 import json
+from collections import OrderedDict
+from functools import lru_cache
 from urllib.parse import urlparse
 
+from themes import COLOR_PALETTES, BACKGROUND_STYLES, build_theme_stylesheets, load_theme_stylesheets
+
 # Configure comprehensive logging first
 logging.basicConfig(
     level=logging.INFO,
@@ -45,47 +62,558 @@ except ImportError as e:
     POSTGRES_AVAILABLE = False
     logger.warning(f"PostgreSQL driver not available: {e}. Using SQLite only.")
 
+# Optional imaging library for PNG share preview cards (SVG cards are used without it)
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
+except ImportError as e:
+    PIL_AVAILABLE = False
+    logger.warning(f"Pillow not available: {e}. Share previews will be SVG.")
+
+# Optional AES-GCM for PIN-encrypted static experience bundles
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    CRYPTO_AVAILABLE = True
+except ImportError as e:
+    CRYPTO_AVAILABLE = False
+    logger.warning(f"cryptography not available: {e}. Static experience bundles disabled.")
+
+# Integrity errors raised by either driver (e.g. unique_id collisions)
+DB_INTEGRITY_ERRORS = (sqlite3.IntegrityError, psycopg2.IntegrityError) if POSTGRES_AVAILABLE else (sqlite3.IntegrityError,)
+
+# Development mode: template reload checks, no-cache headers, no template warm-up
+DEVELOPMENT = os.environ.get('FLASK_ENV') == 'development'
+
 # Initialize Flask app with production configuration
 app = Flask(__name__)
 app.config.update(
     SECRET_KEY=os.environ.get('SECRET_KEY', secrets.token_hex(32)),
     MAX_CONTENT_LENGTH=100 * 1024 * 1024,  # 100MB max file size
-    TEMPLATES_AUTO_RELOAD=True,  # Auto-reload templates for development
+    TEMPLATES_AUTO_RELOAD=DEVELOPMENT,  # Re-stat templates on every render only in development
+    TEMPLATE_CACHE_DIR=os.environ.get('TEMPLATE_CACHE_DIR', '.jinja_cache'),  # Shared compiled-template cache
+    TEMPLATE_WARMUP=os.environ.get('TEMPLATE_WARMUP', '0' if DEVELOPMENT else '1') == '1',  # Load templates at boot
+    SERVICE_WORKER=os.environ.get('SERVICE_WORKER', '0' if DEVELOPMENT else '1') == '1',  # Offline-first repeat opens
     SEND_FILE_MAX_AGE_DEFAULT=0,  # Disable caching for development
     DATABASE_URL=os.environ.get('DATABASE_URL', 'valentine_experiences.db'),
+    DATABASE_REPLICA_URLS=[url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()],
+    REPLICA_PIN_SECONDS=int(os.environ.get('REPLICA_PIN_SECONDS', 30)),  # Read-your-writes window after a create
+    REPLICA_RETRY_SECONDS=int(os.environ.get('REPLICA_RETRY_SECONDS', 30)),  # How long a failed replica is skipped
+    DB_POOL_SIZE=int(os.environ.get('DB_POOL_SIZE', 10)),  # Pooled PostgreSQL read connections per target
+    DATABASE_SHARD_URLS=[url.strip() for url in os.environ.get('DATABASE_SHARD_URLS', '').split(',') if url.strip()],
+    DATABASE_SHARD_URLS_NEXT=[url.strip() for url in os.environ.get('DATABASE_SHARD_URLS_NEXT', '').split(',') if url.strip()],
     UPLOAD_FOLDER='uploads',
+    MEDIA_TIERING=os.environ.get('MEDIA_TIERING', '').lower() in ('1', 'true', 'yes'),  # Move idle videos to the cold tier
+    MEDIA_COLD_FOLDER=os.environ.get('MEDIA_COLD_FOLDER', 'media_cold'),  # Stand-in for object storage
+    MEDIA_INDEX_DB=os.environ.get('MEDIA_INDEX_DB', 'media_tiers.db'),  # Last access per video (node-local)
+    MEDIA_COLD_AFTER_DAYS=float(os.environ.get('MEDIA_COLD_AFTER_DAYS', 14)),
+    MEDIA_TIER_INTERVAL_SECONDS=float(os.environ.get('MEDIA_TIER_INTERVAL_SECONDS', 3600)),
+    MEDIA_ACCESS_FLUSH_SECONDS=float(os.environ.get('MEDIA_ACCESS_FLUSH_SECONDS', 60)),
+    MEDIA_COLD_RECOMPRESS=os.environ.get('MEDIA_COLD_RECOMPRESS', '').lower() in ('1', 'true', 'yes'),  # Needs ffmpeg
+    MEDIA_COLD_CRF=int(os.environ.get('MEDIA_COLD_CRF', 28)),  # x264 quality for recompressed cold videos
+    PREVIEW_FOLDER='uploads/previews',  # Pre-generated share preview cards
+    UNFURL_CACHE_SECONDS=int(os.environ.get('UNFURL_CACHE_SECONDS', 3600)),  # Crawler OG responses
+    UNFURL_CACHE_SIZE=int(os.environ.get('UNFURL_CACHE_SIZE', 2048)),
+    STATIC_BUNDLES=os.environ.get('STATIC_BUNDLES', '').lower() in ('1', 'true', 'yes'),  # PIN-encrypted static pages
+    BUNDLE_FOLDER='experiences',
+    BUNDLE_KDF_ITERATIONS=int(os.environ.get('BUNDLE_KDF_ITERATIONS', 600000)),  # PBKDF2 rounds per PIN guess
+    BUNDLE_CACHE_SECONDS=int(os.environ.get('BUNDLE_CACHE_SECONDS', 3600)),
+    CUSTOM_CSS_FOLDER='uploads/css',  # Compiled creator CSS, content-hashed and shared between experiences
+    CUSTOM_CSS_MAX_INPUT_BYTES=int(os.environ.get('CUSTOM_CSS_MAX_INPUT_BYTES', 64 * 1024)),
+    CUSTOM_CSS_MAX_BYTES=int(os.environ.get('CUSTOM_CSS_MAX_BYTES', 16 * 1024)),  # After minification
+    THEME_FOLDER='themes',  # Precomputed palette x background stylesheets (filled by build.sh)
     ALLOWED_EXTENSIONS={'mp4', 'mov', 'avi', 'mkv', 'webm'},
+    UPLOAD_MAX_BYTES={  # Per-type video caps, enforced while the upload streams to disk
+        'mp4': 100 * 1024 * 1024,
+        'mov': 100 * 1024 * 1024,
+        'mkv': 100 * 1024 * 1024,
+        'webm': 50 * 1024 * 1024,
+        'avi': 50 * 1024 * 1024
+    },
+    CREATE_FORM_MAX_BYTES=256 * 1024,  # All /create text fields together
     MAX_EXPERIENCES_PER_IP=100,  # Increased for testing
-    EXPERIENCE_EXPIRY_DAYS=365  # Experiences expire after 1 year
+    EXPERIENCE_EXPIRY_DAYS=365,  # Experiences expire after 1 year
+    VIEW_RETENTION_MONTHS=int(os.environ.get('VIEW_RETENTION_MONTHS', 13)),  # Monthly view partitions kept (0 = forever)
+    VIEW_PARTITIONS_AHEAD=int(os.environ.get('VIEW_PARTITIONS_AHEAD', 2)),  # Future months created by maintenance
+    VIEW_STATS_DAYS=int(os.environ.get('VIEW_STATS_DAYS', 30)),  # Daily view history returned by /api/stats
+    BULK_API_TOKEN=os.environ.get('BULK_API_TOKEN'),  # Bulk import is disabled unless a token is configured
+    ADMIN_API_TOKEN=os.environ.get('ADMIN_API_TOKEN'),  # Admin search is disabled unless a token is configured
+    ADMIN_MAX_PAGE_SIZE=int(os.environ.get('ADMIN_MAX_PAGE_SIZE', 200)),
+    BULK_CHUNK_SIZE=int(os.environ.get('BULK_CHUNK_SIZE', 500)),  # Rows per ID allocation + insert transaction
+    BULK_MAX_ROWS=int(os.environ.get('BULK_MAX_ROWS', 50000)),  # Hard cap on rows per bulk request
+    # Readiness probe: check interval and degraded/unhealthy thresholds
+    READINESS_INTERVAL_SECONDS=float(os.environ.get('READINESS_INTERVAL_SECONDS', 10)),
+    READINESS_STALE_SECONDS=float(os.environ.get('READINESS_STALE_SECONDS', 30)),  # Stuck check => unhealthy
+    READINESS_STARTUP_WAIT_SECONDS=float(os.environ.get('READINESS_STARTUP_WAIT_SECONDS', 5)),  # First probe waits for the first check
+    READINESS_DB_DEGRADED_MS=float(os.environ.get('READINESS_DB_DEGRADED_MS', 250)),
+    READINESS_DB_UNHEALTHY_MS=float(os.environ.get('READINESS_DB_UNHEALTHY_MS', 2000)),
+    READINESS_POOL_DEGRADED=float(os.environ.get('READINESS_POOL_DEGRADED', 0.8)),  # Fraction of pool in use
+    READINESS_POOL_UNHEALTHY=float(os.environ.get('READINESS_POOL_UNHEALTHY', 1.0)),
+    READINESS_DISK_DEGRADED_MB=float(os.environ.get('READINESS_DISK_DEGRADED_MB', 1024)),  # Free space in uploads/
+    READINESS_DISK_UNHEALTHY_MB=float(os.environ.get('READINESS_DISK_UNHEALTHY_MB', 100)),
+    READINESS_QUEUE_DEGRADED=int(os.environ.get('READINESS_QUEUE_DEGRADED', 100)),
+    READINESS_QUEUE_UNHEALTHY=int(os.environ.get('READINESS_QUEUE_UNHEALTHY', 1000))
 )
 
+if app.config['STATIC_BUNDLES'] and not CRYPTO_AVAILABLE:
+    logger.warning("STATIC_BUNDLES is set but cryptography is not installed; serving experiences dynamically")
+    app.config['STATIC_BUNDLES'] = False
+if app.config['STATIC_BUNDLES']:
+    logger.warning("STATIC_BUNDLES is on: a bundle is protected only by its 4-digit PIN, which anyone who "
+                   "fetches it can brute-force offline whatever BUNDLE_KDF_ITERATIONS is")
+
+# Optional ffmpeg for recompressing videos on their way to the cold tier
+FFMPEG_PATH = shutil.which('ffmpeg')
+if app.config['MEDIA_COLD_RECOMPRESS'] and not FFMPEG_PATH:
+    logger.warning("MEDIA_COLD_RECOMPRESS is set but ffmpeg is not installed; cold videos are stored unchanged")
+    app.config['MEDIA_COLD_RECOMPRESS'] = False
+
 # Ensure required directories exist
 REQUIRED_DIRS = [
     'static', 'static/css', 'static/js', 'static/images', 
-    'templates', 'uploads', 'experiences'
+    'templates', 'uploads', 'uploads/previews', 'uploads/css', 'experiences', 'themes'
 ]
-for directory in REQUIRED_DIRS:
+for directory in REQUIRED_DIRS + [app.config['TEMPLATE_CACHE_DIR']]:
     Path(directory).mkdir(parents=True, exist_ok=True)
     logger.info(f"Ensured directory exists: {directory}")
 
+# Compiled templates are shared on disk, so workers load bytecode instead of compiling from source
+app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(app.config['TEMPLATE_CACHE_DIR'])}
+
+def warm_templates():
+    """Load every template into the Jinja cache (compiling into the bytecode cache when it is cold)"""
+    started = time.perf_counter()
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    logger.info(f"Warmed {len(names)} templates in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return names
+
+def build_asset_manifest():
+    """Content hash of every static file, used to version asset URLs and the service worker caches"""
+    static_root = Path(app.static_folder)
+    return {
+        path.relative_to(static_root).as_posix(): hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+        for path in sorted(static_root.rglob('*'))
+        if path.is_file()
+    }
+
+ASSET_MANIFEST = build_asset_manifest()
+ASSET_VERSION = hashlib.sha256(json.dumps(ASSET_MANIFEST, sort_keys=True).encode()).hexdigest()[:12]
+
+# Scripts and styles of the experience page, precached by the service worker
+EXPERIENCE_ASSETS = [
+    'css/experience.css', 'css/particle-animations.css', 'css/svg-animations.css', 'css/typography-animations.css',
+    'js/particle-systems.js', 'js/svg-animations.js', 'js/typography-manager.js',
+    'js/experience.js', 'js/experience-bundle.js'
+]
+
+@app.template_global()
+def asset_url(filename):
+    """Static URL versioned by the file's content hash, so a deploy changes exactly the URLs that changed"""
+    return url_for('static', filename=filename, v=ASSET_MANIFEST.get(filename, ASSET_VERSION))
+
+EXPERIENCE_COLUMNS = (
+    'id', 'unique_id', 'creator_name', 'recipient_name', 'creator_email',
+    'personal_message', 'memory_text', 'question_text', 'color_palette', 'background_style',
+    'video_filename', 'music_filename', 'custom_css', 'access_pin', 'creator_ip',
+    'created_at', 'expires_at', 'view_count', 'is_active', 'metadata',
+    'font_style', 'text_effect', 'text_animation', 'particle_system', 'svg_animation'
+)
+
+# Every column except the surrogate key, used when moving rows between databases
+MIGRATED_COLUMNS = tuple(column for column in EXPERIENCE_COLUMNS if column != 'id')
+
+# Queries shared by both databases. "?" marks a parameter and {tokens} are
+# filled in per dialect, so each statement is written exactly once.
+SQL_DIALECTS = {
+    'postgres': {
+        'true': 'TRUE', 'now': 'NOW()', 'day_ago': "NOW() - INTERVAL '1 day'",
+        'or_ignore': '', 'on_conflict': 'ON CONFLICT (unique_id) DO NOTHING', 'do_nothing': 'ON CONFLICT DO NOTHING',
+        'view_day': 'CAST(viewed_at AS DATE)', 'view_month': "date_trunc('month', viewed_at)"
+    },
+    'sqlite': {
+        'true': '1', 'now': "datetime('now')", 'day_ago': "datetime('now', '-1 day')",
+        'or_ignore': 'OR IGNORE', 'on_conflict': '', 'do_nothing': '',
+        'view_day': 'date(viewed_at)', 'view_month': "strftime('%Y-%m-01', viewed_at)"
+    }
+}
+
+QUERIES = {
+    'experience_by_id': '''
+        SELECT {columns} FROM valentine_experiences
+        WHERE unique_id = ? AND is_active = {true} AND expires_at > {now}
+    ''',
+    'id_exists': 'SELECT id FROM valentine_experiences WHERE unique_id = ?',
+    'creator_count': '''
+        SELECT COUNT(*) FROM valentine_experiences
+        WHERE creator_ip = ? AND created_at > {day_ago}
+    ''',
+    'increment_view_count': 'UPDATE valentine_experiences SET view_count = view_count + 1 WHERE unique_id = ?',
+    'user_agent_id': 'SELECT id FROM user_agents WHERE user_agent = ?',
+    'add_user_agent': 'INSERT {or_ignore} INTO user_agents (user_agent) VALUES (?) {do_nothing}',
+    'ping': 'SELECT 1',
+    'count_experiences': 'SELECT COUNT(*) FROM valentine_experiences',
+    'purge_expired': 'DELETE FROM valentine_experiences WHERE expires_at < {now}',
+    # Resharding: page rows out by primary key and copy them in idempotently
+    'export_batch': f"SELECT id, {', '.join(MIGRATED_COLUMNS)} FROM valentine_experiences WHERE id > ? ORDER BY id LIMIT ?",
+    'import_row': (
+        f"INSERT {{or_ignore}} INTO valentine_experiences ({', '.join(MIGRATED_COLUMNS)}) "
+        f"VALUES ({', '.join(['?'] * len(MIGRATED_COLUMNS))}) {{on_conflict}}"
+    ),
+    'delete_experience': 'DELETE FROM valentine_experiences WHERE unique_id = ?'
+}
+
+# View log statements, run against one monthly partition on SQLite or the partitioned parent on PostgreSQL
+VIEW_QUERIES = {
+    'log_view': 'INSERT INTO {table} (experience_id, viewer_ip, viewed_at, user_agent_id) VALUES (?, ?, ?, ?)',
+    'daily_views': '''
+        SELECT {view_day}, COUNT(*), COUNT(DISTINCT viewer_ip) FROM {table}
+        WHERE experience_id = ? AND viewed_at >= ? GROUP BY 1 ORDER BY 1
+    ''',
+    'export_views': '''
+        SELECT v.experience_id, v.viewer_ip, v.viewed_at, u.user_agent FROM {table} v
+        LEFT JOIN user_agents u ON u.id = v.user_agent_id WHERE v.experience_id = ?
+    ''',
+    'delete_views': 'DELETE FROM {table} WHERE experience_id = ?'
+}
+
+# Monthly view log partitions, e.g. experience_views_2026_02
+VIEW_PARTITION_PATTERN = re.compile(r'^experience_views_(\d{4})_(\d{2})$')
+USER_AGENT_MAX_LENGTH = 512
+
+def month_start(moment, offset=0):
+    """First day of the month `offset` months after the one containing `moment`"""
+    index = moment.year * 12 + moment.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def view_partition_name(month):
+    return f"experience_views_{month:%Y_%m}"
+
+def view_clock():
+    """View timestamps are naive UTC, matching SQLite's CURRENT_TIMESTAMP"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+# Column projections per use case - only fetch what the caller actually reads
+EXPERIENCE_PROJECTIONS = {
+    'full': EXPERIENCE_COLUMNS,
+    'view': (
+        'unique_id', 'creator_name', 'recipient_name', 'personal_message', 'memory_text',
+        'question_text', 'color_palette', 'background_style', 'video_filename', 'custom_css',
+        'access_pin', 'view_count', 'font_style', 'text_effect', 'text_animation',
+        'particle_system', 'svg_animation'
+    ),
+    'stats': ('view_count', 'created_at', 'recipient_name'),
+    'preview': ('color_palette',),
+    'pin': ('access_pin',),
+    'admin': (
+        'unique_id', 'creator_name', 'recipient_name', 'creator_email', 'creator_ip',
+        'created_at', 'expires_at', 'view_count', 'is_active'
+    )
+}
+
+class ExperienceRecord:
+    """Compact experience row. Only the projected columns are set; metadata JSON is decoded on first access."""
+
+    __slots__ = tuple(column for column in EXPERIENCE_COLUMNS if column != 'metadata') + ('_metadata_raw', '_metadata')
+
+    def __init__(self, columns, values):
+        self._metadata_raw = None
+        for column, value in zip(columns, values):
+            if column == 'metadata':
+                self._metadata_raw = value
+            else:
+                setattr(self, column, value)
+
+    @property
+    def metadata(self):
+        try:
+            return self._metadata
+        except AttributeError:
+            self._metadata = json.loads(self._metadata_raw) if self._metadata_raw else None
+            return self._metadata
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+# Server-side prepared statements need a place to remember what each pooled connection has prepared
+if POSTGRES_AVAILABLE:
+    import psycopg2.pool
+
+    class PreparedStatementConnection(psycopg2.extensions.connection):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.prepared = set()
+
+class UniqueIdsExhausted(Exception):
+    """Raised when no free unique ID turns up within the allowed attempts (the ID space is nearly full)"""
+
 # Database setup and management
 class DatabaseManager:
     """Handles all database operations with proper error handling for both SQLite and PostgreSQL"""
     
-    def __init__(self, db_url):
+    # Candidate rounds before giving up on finding free IDs (there are only ~640k readable IDs)
+    ID_ALLOCATION_ATTEMPTS = 50
+
+    # Column order shared by every INSERT into valentine_experiences
+    INSERT_COLUMNS = (
+        'unique_id', 'creator_name', 'recipient_name', 'creator_email',
+        'personal_message', 'memory_text', 'question_text',
+        'color_palette', 'background_style', 'video_filename',
+        'music_filename', 'custom_css', 'access_pin', 'creator_ip', 'expires_at', 'metadata',
+        'font_style', 'text_effect', 'text_animation', 'particle_system', 'svg_animation'
+    )
+
+    def __init__(self, db_url, replica_urls=None):
         self.db_url = db_url
-        self.is_postgres = db_url.startswith('postgresql://') or db_url.startswith('postgres://')
-        logger.info(f"Initializing database: {'PostgreSQL' if self.is_postgres else 'SQLite'}")
+        self.is_postgres = self.is_postgres_url(db_url)
+        self.placeholder = '%s' if self.is_postgres else '?'
+        self.insert_sql = (
+            f"INSERT INTO valentine_experiences ({', '.join(self.INSERT_COLUMNS)}) "
+            f"VALUES ({', '.join([self.placeholder] * len(self.INSERT_COLUMNS))})"
+        )
+
+        # Render every named query for this dialect once, plus a $n form for PREPARE on PostgreSQL
+        templates = dict(QUERIES)
+        for projection, columns in EXPERIENCE_PROJECTIONS.items():
+            templates[f'experience_by_id:{projection}'] = QUERIES['experience_by_id'].replace('{columns}', ', '.join(columns))
+        dialect = self.dialect = SQL_DIALECTS['postgres' if self.is_postgres else 'sqlite']
+        self.sql = {}
+        self.prepared_sql = {}
+        for name, template in templates.items():
+            if '{columns}' in template:
+                continue
+            sql = ' '.join(template.format(**dialect).split())
+            self.sql[name] = sql.replace('?', self.placeholder)
+            counter = iter(range(1, sql.count('?') + 1))
+            self.prepared_sql[name] = re.sub(r'\?', lambda match: f'${next(counter)}', sql)
+        self.pools = {}
+        self.pool_in_use = {}  # url -> pooled connections currently borrowed
+
+        # View log partitions known to exist, and a small cache of dictionary-encoded user agents
+        self.view_lock = threading.Lock()
+        self.view_partitions = set()
+        self.user_agent_ids = OrderedDict()
+        self.search_index = None  # 'tsvector', 'fts5', or None when admin search has to scan
+
+        # Read replicas must speak the same SQL dialect as the primary
+        self.replica_urls = []
+        for replica_url in replica_urls or []:
+            if self.is_postgres_url(replica_url) != self.is_postgres:
+                logger.warning(f"Ignoring replica {self.describe_target(replica_url)}: dialect differs from primary")
+                continue
+            self.replica_urls.append(replica_url)
+
+        self.routing_lock = threading.Lock()
+        self.next_replica = 0
+        self.primary_pins = {}  # unique_id -> monotonic time until which reads go to the primary
+        self.target_stats = {
+            url: {
+                'role': 'primary' if url == db_url else 'replica',
+                'queries': 0,
+                'errors': 0,
+                'total_ms': 0.0,
+                'last_ms': None,
+                'unhealthy_until': 0.0,
+                'last_error': None
+            }
+            for url in [db_url] + self.replica_urls
+        }
+
+        logger.info(f"Initializing database: {'PostgreSQL' if self.is_postgres else 'SQLite'} "
+                    f"with {len(self.replica_urls)} read replica(s)")
         self.init_database()
-    
+
+    @staticmethod
+    def is_postgres_url(url):
+        return url.startswith('postgresql://') or url.startswith('postgres://')
+
+    @staticmethod
+    def describe_target(url):
+        """Human readable target name without credentials"""
+        parsed = urlparse(url)
+        if parsed.scheme.startswith('postgres'):
+            return f"{parsed.hostname}:{parsed.port or 5432}{parsed.path}"
+        return url
+
     def get_connection(self):
         """Get database connection based on database type"""
+        return self.connect(self.db_url)
+
+    def connect(self, url):
+        """Open a connection to the primary or one of the replicas"""
         if self.is_postgres:
             if not POSTGRES_AVAILABLE:
                 raise ImportError("PostgreSQL driver not available. Please install psycopg2-binary.")
-            return psycopg2.connect(self.db_url)
+            return psycopg2.connect(url)
+        elif url != self.db_url:
+            # Read-only, so a wrong replica path fails instead of creating an empty database
+            return sqlite3.connect(f"{Path(url).resolve().as_uri()}?mode=ro", uri=True)
         else:
-            return sqlite3.connect(self.db_url)
+            return sqlite3.connect(url)
+
+    def acquire(self, url):
+        """Borrow a read connection: pooled and autocommit on PostgreSQL, a fresh connection on SQLite"""
+        if not self.is_postgres:
+            return self.connect(url)
+        if not POSTGRES_AVAILABLE:
+            raise ImportError("PostgreSQL driver not available. Please install psycopg2-binary.")
+
+        with self.routing_lock:
+            pool = self.pools.get(url)
+            if pool is None:
+                pool = psycopg2.pool.ThreadedConnectionPool(
+                    0, app.config['DB_POOL_SIZE'], url,
+                    connection_factory=PreparedStatementConnection
+                )
+                self.pools[url] = pool
+        try:
+            conn = pool.getconn()
+            with self.routing_lock:
+                self.pool_in_use[url] = self.pool_in_use.get(url, 0) + 1
+        except psycopg2.pool.PoolError:
+            logger.warning(f"Connection pool for {self.describe_target(url)} exhausted, opening an extra connection")
+            conn = self.connect(url)
+        conn.autocommit = True
+        return conn
+
+    def release(self, url, conn, broken=False):
+        """Return a read connection to its pool (or close it if it was not pooled)"""
+        if getattr(conn, 'prepared', None) is not None and url in self.pools:
+            self.pools[url].putconn(conn, close=broken or bool(conn.closed))
+            with self.routing_lock:
+                self.pool_in_use[url] -= 1
+        else:
+            conn.close()
+
+    def run(self, conn, name, params=()):
+        """Execute a named query, as a server-side prepared statement on pooled PostgreSQL connections"""
+        cursor = conn.cursor()
+        prepared = getattr(conn, 'prepared', None)
+        if prepared is not None:
+            statement = name.replace(':', '_')
+            if statement not in prepared:
+                cursor.execute(f"PREPARE {statement} AS {self.prepared_sql[name]}")
+                prepared.add(statement)
+            arguments = f" ({', '.join(['%s'] * len(params))})" if params else ''
+            cursor.execute(f"EXECUTE {statement}{arguments}", params)
+        else:
+            cursor.execute(self.sql[name], params)
+        return cursor
+
+    def pin_to_primary(self, unique_ids):
+        """Route reads for freshly written experiences to the primary for a short window"""
+        if not self.replica_urls:
+            return
+        now = time.monotonic()
+        pinned_until = now + app.config['REPLICA_PIN_SECONDS']
+        with self.routing_lock:
+            if len(self.primary_pins) > 10000:
+                self.primary_pins = {key: until for key, until in self.primary_pins.items() if until > now}
+            for unique_id in unique_ids:
+                self.primary_pins[unique_id] = pinned_until
+
+    def read_targets(self, unique_id=None):
+        """Targets to try for a read, in order: the next healthy replica, then the primary"""
+        if not self.replica_urls:
+            return [self.db_url]
+
+        now = time.monotonic()
+        with self.routing_lock:
+            if unique_id is not None and self.primary_pins.get(unique_id, 0) > now:
+                return [self.db_url]
+
+            for _ in range(len(self.replica_urls)):
+                replica_url = self.replica_urls[self.next_replica]
+                self.next_replica = (self.next_replica + 1) % len(self.replica_urls)
+                if self.target_stats[replica_url]['unhealthy_until'] <= now:
+                    return [replica_url, self.db_url]
+
+        return [self.db_url]
+
+    def execute_read(self, operation, unique_id=None, primary_only=False):
+        """Run operation(conn) on a replica when one is healthy, falling back to the primary"""
+        targets = [self.db_url] if primary_only else self.read_targets(unique_id)
+        for target in targets:
+            started = time.perf_counter()
+            conn = None
+            failed = False
+            try:
+                conn = self.acquire(target)
+                result = operation(conn)
+                self.record_query(target, started)
+                return result
+            except Exception as e:
+                failed = True
+                self.record_query(target, started, error=e)
+                if target == self.db_url:
+                    raise
+                logger.warning(f"Replica {self.describe_target(target)} failed, falling back to primary: {e}")
+            finally:
+                if conn is not None:
+                    self.release(target, conn, broken=failed)
+
+    def record_query(self, target, started, error=None):
+        """Update per-target latency and health bookkeeping"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self.routing_lock:
+            stats = self.target_stats[target]
+            stats['queries'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['last_ms'] = elapsed_ms
+            if error is not None:
+                stats['errors'] += 1
+                stats['last_error'] = str(error)
+                if stats['role'] == 'replica':
+                    stats['unhealthy_until'] = time.monotonic() + app.config['REPLICA_RETRY_SECONDS']
+            elif stats['role'] == 'replica':
+                stats['unhealthy_until'] = 0.0
+
+    def check_replicas(self):
+        """Actively probe every replica so unhealthy ones are detected and recovered ones re-enabled"""
+        for replica_url in self.replica_urls:
+            started = time.perf_counter()
+            conn = None
+            try:
+                conn = self.connect(replica_url)
+                conn.cursor().execute('SELECT 1 FROM valentine_experiences LIMIT 1')
+                self.record_query(replica_url, started)
+            except Exception as e:
+                self.record_query(replica_url, started, error=e)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def get_target_metrics(self):
+        """Per-target query counts, latency and health for monitoring"""
+        now = time.monotonic()
+        with self.routing_lock:
+            return [
+                {
+                    'target': self.describe_target(url),
+                    'role': stats['role'],
+                    'healthy': stats['unhealthy_until'] <= now,
+                    'queries': stats['queries'],
+                    'errors': stats['errors'],
+                    'avg_latency_ms': round(stats['total_ms'] / stats['queries'], 2) if stats['queries'] else None,
+                    'last_latency_ms': round(stats['last_ms'], 2) if stats['last_ms'] is not None else None,
+                    'last_error': stats['last_error']
+                }
+                for url, stats in self.target_stats.items()
+            ]
+
+    def get_pool_stats(self):
+        """Connections in use vs pool size for each pooled PostgreSQL target"""
+        with self.routing_lock:
+            return [
+                {'target': self.describe_target(url), 'in_use': self.pool_in_use.get(url, 0), 'size': pool.maxconn}
+                for url, pool in self.pools.items()
+            ]
     
     def init_database(self):
         """Initialize database with required tables"""
@@ -126,21 +654,14 @@ class DatabaseManager:
                         )
                     ''')
                     
-                    cursor.execute('''
-                        CREATE TABLE IF NOT EXISTS experience_views (
-                            id SERIAL PRIMARY KEY,
-                            experience_id TEXT NOT NULL,
-                            viewer_ip TEXT,
-                            viewed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            user_agent TEXT,
-                            FOREIGN KEY (experience_id) REFERENCES valentine_experiences (unique_id)
-                        )
-                    ''')
+                    self.init_view_log(conn)
                     
                     # Create indexes for PostgreSQL
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_unique_id ON valentine_experiences(unique_id)')
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_expires_at ON valentine_experiences(expires_at)')
                     cursor.execute('CREATE INDEX IF NOT EXISTS idx_creator_ip ON valentine_experiences(creator_ip)')
+                    cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON valentine_experiences(created_at, unique_id)')
+                    self.init_search_index(conn)
                     
                 else:
                     # SQLite version
@@ -205,21 +726,14 @@ class DatabaseManager:
                             conn.execute(f'ALTER TABLE valentine_experiences ADD COLUMN {col_name} {col_definition}')
                             logger.info(f"Added {col_name} column successfully")
                     
-                    conn.execute('''
-                        CREATE TABLE IF NOT EXISTS experience_views (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            experience_id TEXT NOT NULL,
-                            viewer_ip TEXT,
-                            viewed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            user_agent TEXT,
-                            FOREIGN KEY (experience_id) REFERENCES valentine_experiences (unique_id)
-                        )
-                    ''')
+                    self.init_view_log(conn)
                     
                     # Create indexes for SQLite
                     conn.execute('CREATE INDEX IF NOT EXISTS idx_unique_id ON valentine_experiences(unique_id)')
                     conn.execute('CREATE INDEX IF NOT EXISTS idx_expires_at ON valentine_experiences(expires_at)')
                     conn.execute('CREATE INDEX IF NOT EXISTS idx_creator_ip ON valentine_experiences(creator_ip)')
+                    conn.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON valentine_experiences(created_at, unique_id)')
+                    self.init_search_index(conn)
                 
                 logger.info("Database initialized successfully")
                 
@@ -227,10 +741,262 @@ class DatabaseManager:
             logger.error(f"Database initialization failed: {e}")
             raise
     
-    def create_experience(self, experience_data):
-        """Create a new Valentine's experience"""
+    def init_search_index(self, conn):
+        """Full-text index over creator_name, recipient_name and creator_email for admin search.
+
+        PostgreSQL keeps a generated tsvector column (GIN indexed); SQLite keeps an
+        external-content FTS5 table in sync with triggers. Either way creates and
+        purges update the index incrementally, in the same transaction.
+        """
+        if self.is_postgres:
+            cursor = conn.cursor()
+            # E-mail addresses are split on @ and . so each part is searchable on its own
+            cursor.execute('''
+                ALTER TABLE valentine_experiences ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (to_tsvector('simple',
+                    coalesce(creator_name, '') || ' ' || coalesce(recipient_name, '') || ' ' ||
+                    translate(coalesce(creator_email, ''), '@.', '  ')
+                )) STORED
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_vector ON valentine_experiences USING GIN (search_vector)')
+            self.search_index = 'tsvector'
+            return
+
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'experiences_fts'").fetchone() is not None
+        try:
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS experiences_fts USING fts5(
+                    creator_name, recipient_name, creator_email,
+                    content='valentine_experiences', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 not available: {e}. Admin search will scan the table.")
+            return
+
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS experiences_fts_insert AFTER INSERT ON valentine_experiences BEGIN
+                INSERT INTO experiences_fts (rowid, creator_name, recipient_name, creator_email)
+                VALUES (new.id, new.creator_name, new.recipient_name, new.creator_email);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS experiences_fts_delete AFTER DELETE ON valentine_experiences BEGIN
+                INSERT INTO experiences_fts (experiences_fts, rowid, creator_name, recipient_name, creator_email)
+                VALUES ('delete', old.id, old.creator_name, old.recipient_name, old.creator_email);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS experiences_fts_update
+            AFTER UPDATE OF creator_name, recipient_name, creator_email ON valentine_experiences BEGIN
+                INSERT INTO experiences_fts (experiences_fts, rowid, creator_name, recipient_name, creator_email)
+                VALUES ('delete', old.id, old.creator_name, old.recipient_name, old.creator_email);
+                INSERT INTO experiences_fts (rowid, creator_name, recipient_name, creator_email)
+                VALUES (new.id, new.creator_name, new.recipient_name, new.creator_email);
+            END
+        ''')
+        if not exists:
+            # Index the rows written before the search index existed
+            conn.execute("INSERT INTO experiences_fts (experiences_fts) VALUES ('rebuild')")
+            logger.info("Built the admin search index")
+        conn.commit()
+        self.search_index = 'fts5'
+
+    def init_view_log(self, conn):
+        """Create the user agent dictionary and the monthly partitioned view log.
+
+        PostgreSQL uses native range partitions of experience_views; SQLite gets
+        one experience_views_YYYY_MM table per month. An unpartitioned view log
+        from an older release is copied into partitions in one transaction.
+        """
+        cursor = conn.cursor()
+        if self.is_postgres:
+            cursor.execute('CREATE TABLE IF NOT EXISTS user_agents (id SERIAL PRIMARY KEY, user_agent TEXT UNIQUE NOT NULL)')
+            cursor.execute("SELECT relkind FROM pg_class WHERE relname = 'experience_views' AND relkind IN ('r', 'p')")
+            row = cursor.fetchone()
+            legacy = row is not None and row[0] == 'r'
+            conn.autocommit = False
+        else:
+            cursor.execute('CREATE TABLE IF NOT EXISTS user_agents (id INTEGER PRIMARY KEY, user_agent TEXT UNIQUE NOT NULL)')
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'experience_views'")
+            legacy = cursor.fetchone() is not None
+            if legacy and not conn.in_transaction:
+                cursor.execute('BEGIN')
+
+        if legacy:
+            cursor.execute('ALTER TABLE experience_views RENAME TO experience_views_unpartitioned')
+        if self.is_postgres:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS experience_views (
+                    experience_id TEXT NOT NULL,
+                    viewer_ip TEXT,
+                    viewed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    user_agent_id INTEGER
+                ) PARTITION BY RANGE (viewed_at)
+            ''')
+            # Created on the parent, so every partition gets it
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_views_experience ON experience_views (experience_id, viewed_at)')
+
+        if legacy:
+            cursor.execute(self.render_sql('SELECT DISTINCT {view_month} FROM experience_views_unpartitioned WHERE viewed_at IS NOT NULL'))
+            months = sorted(datetime.fromisoformat(str(row[0])) for row in cursor.fetchall())
+            self.create_view_partitions(conn, months)
+
+            truncated = f"substr(v.user_agent, 1, {USER_AGENT_MAX_LENGTH})"
+            cursor.execute(self.render_sql(
+                f"INSERT {{or_ignore}} INTO user_agents (user_agent) SELECT DISTINCT {truncated} "
+                f"FROM experience_views_unpartitioned v WHERE v.user_agent IS NOT NULL {{do_nothing}}"
+            ))
+            for month in months:
+                table = 'experience_views' if self.is_postgres else view_partition_name(month)
+                cursor.execute(self.render_sql(
+                    f"INSERT INTO {table} (experience_id, viewer_ip, viewed_at, user_agent_id) "
+                    f"SELECT v.experience_id, v.viewer_ip, v.viewed_at, u.id FROM experience_views_unpartitioned v "
+                    f"LEFT JOIN user_agents u ON u.user_agent = {truncated} "
+                    f"WHERE v.viewed_at >= ? AND v.viewed_at < ?"
+                ), (month, month_start(month, 1)))
+            cursor.execute('DROP TABLE experience_views_unpartitioned')
+            logger.info(f"Moved the view log into {len(months)} monthly partitions")
+        conn.commit()
+        if self.is_postgres:
+            conn.autocommit = True
+
+        now = view_clock()
+        self.create_view_partitions(conn, [month_start(now, offset) for offset in range(app.config['VIEW_PARTITIONS_AHEAD'] + 1)])
+        conn.commit()
+
+    def render_sql(self, template, **tokens):
+        """Fill dialect tokens into an ad-hoc statement and use this driver's placeholder"""
+        return template.format(**self.dialect, **tokens).replace('?', self.placeholder)
+
+    def create_view_partitions(self, conn, months):
+        """Create the view log partitions for the given months if they do not exist yet"""
+        cursor = conn.cursor()
+        for month in months:
+            month = month_start(month)
+            name = view_partition_name(month)
+            if self.is_postgres:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF experience_views "
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{month_start(month, 1):%Y-%m-%d}')"
+                )
+            else:
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {name} (
+                        experience_id TEXT NOT NULL,
+                        viewer_ip TEXT,
+                        viewed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                        user_agent_id INTEGER
+                    )
+                ''')
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{name}_experience ON {name} (experience_id, viewed_at)')
+            with self.view_lock:
+                self.view_partitions.add(name)
+
+    def list_view_partitions(self, conn):
+        """Names of the existing monthly view partitions, oldest first"""
+        cursor = conn.cursor()
+        if self.is_postgres:
+            cursor.execute('''
+                SELECT child.relname FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = 'experience_views'
+            ''')
+        else:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB 'experience_views_[0-9]*'")
+        return sorted(row[0] for row in cursor.fetchall() if VIEW_PARTITION_PATTERN.match(row[0]))
+
+    def view_tables(self, conn, since=None):
+        """Tables a view query has to read. PostgreSQL prunes partitions itself from the viewed_at
+        condition; on SQLite only the monthly tables from `since` onwards are listed."""
+        if self.is_postgres:
+            return ['experience_views']
+        partitions = self.list_view_partitions(conn)
+        if since is None:
+            return partitions
+        first = view_partition_name(month_start(since))
+        return [name for name in partitions if name >= first]
+
+    def run_view_query(self, conn, name, table, params=()):
+        cursor = conn.cursor()
+        cursor.execute(self.render_sql(' '.join(VIEW_QUERIES[name].split()), table=table), params)
+        return cursor
+
+    def user_agent_id(self, conn, user_agent):
+        """Dictionary id of a user agent string, adding it on first sight"""
+        if not user_agent:
+            return None
+        user_agent = user_agent[:USER_AGENT_MAX_LENGTH]
+        with self.view_lock:
+            agent_id = self.user_agent_ids.get(user_agent)
+            if agent_id is not None:
+                self.user_agent_ids.move_to_end(user_agent)
+                return agent_id
+
+        row = self.run(conn, 'user_agent_id', (user_agent,)).fetchone()
+        if row is None:
+            # Not cached until committed: a rolled back id could be handed out again
+            self.run(conn, 'add_user_agent', (user_agent,))
+            return self.run(conn, 'user_agent_id', (user_agent,)).fetchone()[0]
+
+        with self.view_lock:
+            self.user_agent_ids[user_agent] = row[0]
+            if len(self.user_agent_ids) > 1024:
+                self.user_agent_ids.popitem(last=False)
+        return row[0]
+
+    def log_view(self, conn, unique_id, viewer_ip, user_agent, viewed_at=None):
+        """Append one view to the partition of its month (created on first use)"""
+        viewed_at = viewed_at or view_clock()
+        if isinstance(viewed_at, str):
+            viewed_at = datetime.fromisoformat(viewed_at)
+        month = month_start(viewed_at)
+        partition = view_partition_name(month)
+        if partition not in self.view_partitions:
+            self.create_view_partitions(conn, [month])
+        table = 'experience_views' if self.is_postgres else partition
+        self.run_view_query(conn, 'log_view', table, (unique_id, viewer_ip, viewed_at, self.user_agent_id(conn, user_agent)))
+
+    def get_view_stats(self, unique_id, since):
+        """Views and distinct viewers per day since `since`, reading only the partitions that can hold them"""
+        def fetch(conn):
+            days = []
+            # Months never overlap, so each day comes from exactly one partition
+            for table in self.view_tables(conn, since):
+                days.extend(self.run_view_query(conn, 'daily_views', table, (unique_id, since)).fetchall())
+            return [{'date': str(day), 'views': views, 'unique_viewers': viewers} for day, views, viewers in days]
+
         try:
-            unique_id = self.generate_unique_id()
+            return self.execute_read(fetch, unique_id)
+        except Exception as e:
+            logger.error(f"Failed to get view stats for {unique_id}: {e}")
+            return []
+
+    def rotate_view_partitions(self):
+        """Create the coming months' view partitions and drop whole months past VIEW_RETENTION_MONTHS"""
+        now = view_clock()
+        retention = app.config['VIEW_RETENTION_MONTHS']
+        oldest_kept = view_partition_name(month_start(now, -retention)) if retention > 0 else None
+        dropped = []
+        with self.get_connection() as conn:
+            self.create_view_partitions(conn, [month_start(now, offset) for offset in range(app.config['VIEW_PARTITIONS_AHEAD'] + 1)])
+            for name in self.list_view_partitions(conn):
+                if oldest_kept and name < oldest_kept:
+                    # Dropping a partition frees the month at once instead of deleting it row by row
+                    conn.cursor().execute(f'DROP TABLE {name}')
+                    dropped.append(name)
+            conn.commit()
+        with self.view_lock:
+            self.view_partitions.difference_update(dropped)
+        logger.info(f"Dropped {len(dropped)} view partitions from {self.describe_target(self.db_url)}")
+        return dropped
+
+    def create_experience(self, experience_data, unique_id=None):
+        """Create a new Valentine's experience (optionally under an already allocated ID)"""
+        try:
+            unique_id = unique_id or self.generate_unique_id()
             
             # Use custom PIN if provided, otherwise generate one
             if experience_data.get('custom_pin'):
@@ -247,72 +1013,13 @@ class DatabaseManager:
             with self.get_connection() as conn:
                 if self.is_postgres:
                     cursor = conn.cursor()
-                    cursor.execute('''
-                        INSERT INTO valentine_experiences (
-                            unique_id, creator_name, recipient_name, creator_email,
-                            personal_message, memory_text, question_text,
-                            color_palette, background_style, video_filename,
-                            music_filename, custom_css, access_pin, creator_ip, expires_at, metadata,
-                            font_style, text_effect, text_animation, particle_system, svg_animation
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ''', (
-                        unique_id,
-                        experience_data.get('creator_name'),
-                        experience_data.get('recipient_name'),
-                        experience_data.get('creator_email'),
-                        experience_data.get('personal_message'),
-                        experience_data.get('memory_text'),
-                        experience_data.get('question_text'),
-                        experience_data.get('color_palette'),
-                        experience_data.get('background_style'),
-                        experience_data.get('video_filename'),
-                        experience_data.get('music_filename'),
-                        experience_data.get('custom_css'),
-                        access_pin,
-                        experience_data.get('creator_ip'),
-                        expires_at,
-                        json.dumps(experience_data.get('metadata', {})),
-                        experience_data.get('font_style', 'sans_modern'),
-                        experience_data.get('text_effect', 'none'),
-                        experience_data.get('text_animation', 'fade_in'),
-                        experience_data.get('particle_system', 'none'),
-                        experience_data.get('svg_animation', 'none')
-                    ))
+                    cursor.execute(self.insert_sql, self.experience_params(unique_id, access_pin, expires_at, experience_data))
                     conn.commit()
                 else:
-                    conn.execute('''
-                        INSERT INTO valentine_experiences (
-                            unique_id, creator_name, recipient_name, creator_email,
-                            personal_message, memory_text, question_text,
-                            color_palette, background_style, video_filename,
-                            music_filename, custom_css, access_pin, creator_ip, expires_at, metadata,
-                            font_style, text_effect, text_animation, particle_system, svg_animation
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        unique_id,
-                        experience_data.get('creator_name'),
-                        experience_data.get('recipient_name'),
-                        experience_data.get('creator_email'),
-                        experience_data.get('personal_message'),
-                        experience_data.get('memory_text'),
-                        experience_data.get('question_text'),
-                        experience_data.get('color_palette'),
-                        experience_data.get('background_style'),
-                        experience_data.get('video_filename'),
-                        experience_data.get('music_filename'),
-                        experience_data.get('custom_css'),
-                        access_pin,
-                        experience_data.get('creator_ip'),
-                        expires_at,
-                        json.dumps(experience_data.get('metadata', {})),
-                        experience_data.get('font_style', 'sans_modern'),
-                        experience_data.get('text_effect', 'none'),
-                        experience_data.get('text_animation', 'fade_in'),
-                        experience_data.get('particle_system', 'none'),
-                        experience_data.get('svg_animation', 'none')
-                    ))
+                    conn.execute(self.insert_sql, self.experience_params(unique_id, access_pin, expires_at, experience_data))
                     conn.commit()
                 
+            self.pin_to_primary([unique_id])
             logger.info(f"Successfully created experience: {unique_id} with PIN: {access_pin}")
             return unique_id, access_pin
             
@@ -320,33 +1027,118 @@ class DatabaseManager:
             logger.error(f"Failed to create experience: {e}")
             logger.error(f"Exception details: {traceback.format_exc()}")
             raise
-    
-    def get_experience(self, unique_id):
-        """Retrieve an experience by unique ID"""
+
+    def experience_params(self, unique_id, access_pin, expires_at, experience_data):
+        """Build the INSERT parameter tuple for one experience, in INSERT_COLUMNS order"""
+        return (
+            unique_id,
+            experience_data.get('creator_name'),
+            experience_data.get('recipient_name'),
+            experience_data.get('creator_email'),
+            experience_data.get('personal_message'),
+            experience_data.get('memory_text'),
+            experience_data.get('question_text'),
+            experience_data.get('color_palette'),
+            experience_data.get('background_style'),
+            experience_data.get('video_filename'),
+            experience_data.get('music_filename'),
+            experience_data.get('custom_css'),
+            access_pin,
+            experience_data.get('creator_ip'),
+            expires_at,
+            json.dumps(experience_data.get('metadata', {})),
+            experience_data.get('font_style', 'sans_modern'),
+            experience_data.get('text_effect', 'none'),
+            experience_data.get('text_animation', 'fade_in'),
+            experience_data.get('particle_system', 'none'),
+            experience_data.get('svg_animation', 'none')
+        )
+
+    def create_experiences_bulk(self, experiences, max_attempts=3):
+        """Create a chunk of experiences in a single transaction.
+
+        IDs are allocated for the whole chunk up front and the rows are written
+        with one executemany/execute_values call. If a concurrent writer grabs
+        one of the allocated IDs the chunk is rolled back and retried with
+        fresh IDs. Returns a list of (unique_id, access_pin) in input order.
+        """
+        expires_at = datetime.now() + timedelta(days=app.config['EXPERIENCE_EXPIRY_DAYS'])
+        access_pins = [data.get('custom_pin') or self.generate_access_pin() for data in experiences]
+
+        for attempt in range(1, max_attempts + 1):
+            unique_ids = self.allocate_unique_ids(len(experiences))
+            try:
+                self.insert_experiences(unique_ids, access_pins, experiences, expires_at)
+                return list(zip(unique_ids, access_pins))
+
+            except DB_INTEGRITY_ERRORS as e:
+                if attempt == max_attempts:
+                    logger.error(f"Bulk insert failed after {attempt} attempts: {e}")
+                    raise
+                logger.warning(f"Unique ID collision during bulk insert (attempt {attempt}), retrying: {e}")
+
+    def insert_experiences(self, unique_ids, access_pins, experiences, expires_at):
+        """Insert already allocated experiences with one executemany/execute_values call in one transaction"""
+        rows = [
+            self.experience_params(unique_id, access_pin, expires_at, data)
+            for unique_id, access_pin, data in zip(unique_ids, access_pins, experiences)
+        ]
+        with self.get_connection() as conn:
+            if self.is_postgres:
+                cursor = conn.cursor()
+                psycopg2.extras.execute_values(
+                    cursor,
+                    f"INSERT INTO valentine_experiences ({', '.join(self.INSERT_COLUMNS)}) VALUES %s",
+                    rows,
+                    page_size=len(rows)
+                )
+                conn.commit()
+            else:
+                conn.executemany(self.insert_sql, rows)
+                conn.commit()
+
+        self.pin_to_primary(unique_ids)
+        logger.info(f"Bulk created {len(rows)} experiences")
+
+    def allocate_unique_ids(self, count):
+        """Allocate `count` unused unique IDs with one existence query per round"""
+        allocated = set()
+        for _ in range(self.ID_ALLOCATION_ATTEMPTS):
+            if len(allocated) >= count:
+                break
+            # One draw per missing ID; duplicates just leave the rest to the next round
+            candidates = {self.generate_candidate_id() for _ in range(count - len(allocated))} - allocated
+
+            allocated.update(candidates - self.find_taken_ids(candidates))
+        if len(allocated) < count:
+            raise UniqueIdsExhausted(f"Found only {len(allocated)} of {count} free IDs in {self.ID_ALLOCATION_ATTEMPTS} rounds")
+
+        return list(allocated)
+
+    def find_taken_ids(self, candidates):
+        """Return the subset of candidate IDs that already exist (single IN query on the primary)"""
+        if not candidates:
+            return set()
+        placeholders = ', '.join([self.placeholder] * len(candidates))
+        query = f'SELECT unique_id FROM valentine_experiences WHERE unique_id IN ({placeholders})'
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, tuple(candidates))
+            return {row[0] for row in cursor.fetchall()}
+
+    def get_experience(self, unique_id, projection='full'):
+        """Retrieve an experience by unique ID as an ExperienceRecord holding only the projected columns"""
+        columns = EXPERIENCE_PROJECTIONS[projection]
+
+        def fetch(conn):
+            return self.run(conn, f'experience_by_id:{projection}', (unique_id,)).fetchone()
+
         try:
-            with self.get_connection() as conn:
-                if self.is_postgres:
-                    cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-                    cursor.execute('''
-                        SELECT * FROM valentine_experiences 
-                        WHERE unique_id = %s AND is_active = TRUE AND expires_at > NOW()
-                    ''', (unique_id,))
-                    experience = cursor.fetchone()
-                else:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.execute('''
-                        SELECT * FROM valentine_experiences 
-                        WHERE unique_id = ? AND is_active = 1 AND expires_at > datetime('now')
-                    ''', (unique_id,))
-                    experience = cursor.fetchone()
-                
-                if experience:
-                    # Convert to dict and parse metadata
-                    exp_dict = dict(experience)
-                    if exp_dict['metadata']:
-                        exp_dict['metadata'] = json.loads(exp_dict['metadata'])
-                    return exp_dict
-                return None
+            row = self.execute_read(fetch, unique_id)
+            if row is None and self.replica_urls:
+                # A replica miss may just be replication lag (e.g. created via another worker)
+                row = self.execute_read(fetch, primary_only=True)
+            return ExperienceRecord(columns, row) if row else None
                 
         except Exception as e:
             logger.error(f"Failed to get experience {unique_id}: {e}")
@@ -356,36 +1148,9 @@ class DatabaseManager:
         """Increment view count and log the view"""
         try:
             with self.get_connection() as conn:
-                if self.is_postgres:
-                    cursor = conn.cursor()
-                    # Update view count
-                    cursor.execute('''
-                        UPDATE valentine_experiences 
-                        SET view_count = view_count + 1 
-                        WHERE unique_id = %s
-                    ''', (unique_id,))
-                    
-                    # Log the view
-                    cursor.execute('''
-                        INSERT INTO experience_views (experience_id, viewer_ip, user_agent)
-                        VALUES (%s, %s, %s)
-                    ''', (unique_id, viewer_ip, user_agent))
-                    conn.commit()
-                else:
-                    # Update view count
-                    conn.execute('''
-                        UPDATE valentine_experiences 
-                        SET view_count = view_count + 1 
-                        WHERE unique_id = ?
-                    ''', (unique_id,))
-                    
-                    # Log the view
-                    conn.execute('''
-                        INSERT INTO experience_views (experience_id, viewer_ip, user_agent)
-                        VALUES (?, ?, ?)
-                    ''', (unique_id, viewer_ip, user_agent))
-                    
-                    conn.commit()
+                self.run(conn, 'increment_view_count', (unique_id,))
+                self.log_view(conn, unique_id, viewer_ip, user_agent)
+                conn.commit()
                 
         except Exception as e:
             logger.error(f"Failed to increment view count for {unique_id}: {e}")
@@ -393,220 +1158,761 @@ class DatabaseManager:
     def get_creator_experience_count(self, creator_ip):
         """Get number of experiences created by an IP"""
         try:
-            with self.get_connection() as conn:
-                if self.is_postgres:
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        SELECT COUNT(*) FROM valentine_experiences 
-                        WHERE creator_ip = %s AND created_at > NOW() - INTERVAL '1 day'
-                    ''', (creator_ip,))
-                    return cursor.fetchone()[0]
-                else:
-                    cursor = conn.execute('''
-                        SELECT COUNT(*) FROM valentine_experiences 
-                        WHERE creator_ip = ? AND created_at > datetime('now', '-1 day')
-                    ''', (creator_ip,))
-                    return cursor.fetchone()[0]
+            return self.execute_read(lambda conn: self.run(conn, 'creator_count', (creator_ip,)).fetchone()[0])
+        except Exception as e:
+            logger.error(f"Failed to get creator count: {e}")
+            return 0
+    
+    def generate_access_pin(self):
+        """Generate a 4-digit access PIN"""
+        return f"{secrets.randbelow(10000):04d}"
+    
+    def generate_candidate_id(self):
+        """Generate a readable ID with words and numbers (not checked for uniqueness)"""
+        adjectives = ['sweet', 'lovely', 'romantic', 'beautiful', 'magical', 'dreamy', 'tender', 'precious']
+        nouns = ['heart', 'love', 'kiss', 'hug', 'smile', 'moment', 'memory', 'feeling']
+        
+        adjective = secrets.choice(adjectives)
+        noun = secrets.choice(nouns)
+        number = secrets.randbelow(9999)
+        
+        return f"{adjective}-{noun}-{number:04d}"
+    
+    def generate_unique_id(self):
+        """Generate a unique, URL-safe ID"""
+        for _ in range(self.ID_ALLOCATION_ATTEMPTS):
+            unique_id = self.generate_candidate_id()
+            
+            # Check if ID already exists
+            try:
+                if not self.id_exists(unique_id):
+                    return unique_id
+            except Exception:
+                continue
+        raise UniqueIdsExhausted(f"No free ID found in {self.ID_ALLOCATION_ATTEMPTS} attempts")
+
+    def id_exists(self, unique_id):
+        """Check the primary for an existing experience with this ID"""
+        with self.get_connection() as conn:
+            return self.run(conn, 'id_exists', (unique_id,)).fetchone() is not None
+
+    def ping(self):
+        """Round trip to the primary, raising if it is unreachable"""
+        with self.get_connection() as conn:
+            self.run(conn, 'ping').fetchone()
+
+    def search_experiences(self, query=None, status='all', creator_ip=None, after=None, limit=50):
+        """Admin listing, newest first, keyset paginated on (created_at, unique_id).
+
+        `query` matches word prefixes of the creator name, recipient name and
+        e-mail through the full-text index. `after` is the (created_at, unique_id)
+        of the last row of the previous page. Returns dicts of the 'admin' projection.
+        """
+        columns = EXPERIENCE_PROJECTIONS['admin']
+        conditions, params = [], []
+
+        terms = re.findall(r'\w+', (query or '').lower())[:8]
+        # An e-mail address is matched as a phrase: ANDing "example" and "com" would touch every row
+        is_address = '@' in (query or '')
+        if terms and self.search_index == 'tsvector':
+            conditions.append("search_vector @@ to_tsquery('simple', ?)")
+            if is_address:
+                params.append(' <-> '.join(terms[:-1] + [f'{terms[-1]}:*']))
+            else:
+                params.append(' & '.join(f'{term}:*' for term in terms))
+        elif terms and self.search_index == 'fts5':
+            conditions.append('id IN (SELECT rowid FROM experiences_fts WHERE experiences_fts MATCH ?)')
+            params.append(f'''"{' '.join(terms)}"*''' if is_address else ' AND '.join(f'"{term}"*' for term in terms))
+        else:
+            for term in terms:
+                conditions.append('(creator_name LIKE ? OR recipient_name LIKE ? OR creator_email LIKE ?)')
+                params.extend([f'%{term}%'] * 3)
+
+        if creator_ip:
+            conditions.append('creator_ip = ?')
+            params.append(creator_ip)
+        if status == 'active':
+            conditions.append('is_active = {true} AND expires_at > {now}')
+        elif status == 'expired':
+            conditions.append('(is_active <> {true} OR expires_at <= {now})')
+        if after:
+            conditions.append('(created_at, unique_id) < (?, ?)')
+            params.extend(after)
+
+        sql = f"SELECT {', '.join(columns)} FROM valentine_experiences"
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        sql += ' ORDER BY created_at DESC, unique_id DESC LIMIT ?'
+        params.append(limit)
+
+        def fetch(conn):
+            cursor = conn.cursor()
+            cursor.execute(self.render_sql(sql), params)
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        return self.execute_read(fetch)
+
+    def count_experiences(self):
+        with self.get_connection() as conn:
+            return self.run(conn, 'count_experiences').fetchone()[0]
+
+    def purge_expired_experiences(self):
+        """Delete expired experiences, returning how many were removed.
+
+        Their views age out with the monthly partitions (see rotate_view_partitions).
+        """
+        with self.get_connection() as conn:
+            purged = self.run(conn, 'purge_expired').rowcount
+            conn.commit()
+        logger.info(f"Purged {purged} expired experiences from {self.describe_target(self.db_url)}")
+        return purged
+
+    def export_experience_rows(self, after_id=0, limit=500):
+        """Page through full experience rows by primary key: (id, *MIGRATED_COLUMNS)"""
+        with self.get_connection() as conn:
+            return self.run(conn, 'export_batch', (after_id, limit)).fetchall()
+
+    def export_view_rows(self, unique_id):
+        """Views of one experience as (experience_id, viewer_ip, viewed_at, user_agent)"""
+        with self.get_connection() as conn:
+            return [
+                row
+                for table in self.view_tables(conn)
+                for row in self.run_view_query(conn, 'export_views', table, (unique_id,)).fetchall()
+            ]
+
+    def import_experience_rows(self, rows, source):
+        """Copy exported rows plus their view logs from `source` in one transaction.
+
+        Rows whose unique_id already exists here are skipped (views included),
+        so an interrupted copy can simply be re-run.
+        """
+        imported = 0
+        with self.get_connection() as conn:
+            for row in rows:
+                if self.run(conn, 'import_row', tuple(row[1:])).rowcount == 1:
+                    imported += 1
+                    for experience_id, viewer_ip, viewed_at, user_agent in source.export_view_rows(row[1]):
+                        self.log_view(conn, experience_id, viewer_ip, user_agent, viewed_at)
+            conn.commit()
+        return imported
+
+    def delete_experiences(self, unique_ids):
+        """Remove experiences and their view logs (e.g. after they moved to another shard)"""
+        with self.get_connection() as conn:
+            view_tables = self.view_tables(conn)
+            for unique_id in unique_ids:
+                for table in view_tables:
+                    self.run_view_query(conn, 'delete_views', table, (unique_id,))
+                self.run(conn, 'delete_experience', (unique_id,))
+            conn.commit()
+
+def shard_index(unique_id, shard_count):
+    """Stable shard for a unique_id using jump consistent hashing (Lamping & Veach).
+
+    Appending a shard only moves ~1/N of the IDs, so new shard URLs must be
+    added at the end of the list.
+    """
+    key = int.from_bytes(hashlib.sha256(unique_id.encode()).digest()[:8], 'big')
+    bucket, candidate = -1, 0
+    while candidate < shard_count:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+class ShardedDatabaseManager:
+    """Spreads experiences over several databases by a stable hash of unique_id.
+
+    Every shard is a plain DatabaseManager and this class exposes the same
+    interface. Per-experience operations go to the owning shard; cross-shard
+    operations (rate-limit counts, maintenance, health) fan out in parallel.
+
+    During an online reshard the target layout is passed as next_shard_urls:
+    new experiences are written to their owner in the next layout, and reads
+    try that owner first, falling back to the current one until the copy
+    made by `manage_db.py reshard` has caught up.
+    """
+
+    def __init__(self, shard_urls, next_shard_urls=None):
+        managers = {}
+
+        def manager(url):
+            if url not in managers:
+                managers[url] = DatabaseManager(url)
+            return managers[url]
+
+        self.shards = [manager(url) for url in shard_urls]
+        self.next_shards = [manager(url) for url in next_shard_urls] if next_shard_urls else None
+        self.all_shards = list(managers.values())
+        self.db_url = shard_urls[0]
+        self.is_postgres = self.shards[0].is_postgres
+        self.replica_urls = []
+        self.executor = ThreadPoolExecutor(max_workers=len(self.all_shards), thread_name_prefix='shard')
+        logger.info(f"Sharded database: {len(self.shards)} shard(s)"
+                    + (f", migrating to {len(self.next_shards)}" if self.next_shards else ''))
+
+    def shard_for(self, unique_id, layout=None):
+        layout = layout or self.shards
+        return layout[shard_index(unique_id, len(layout))]
+
+    def write_shard(self, unique_id):
+        """Where new rows for this ID go: the next layout while a reshard is in progress"""
+        return self.shard_for(unique_id, self.next_shards)
+
+    def owners(self, unique_id):
+        """Shards that may hold this ID, most authoritative first"""
+        owners = [self.write_shard(unique_id)]
+        current = self.shard_for(unique_id)
+        if current is not owners[0]:
+            owners.append(current)
+        return owners
+
+    def fan_out(self, operation):
+        """Run operation(shard) on every distinct shard in parallel"""
+        return list(self.executor.map(operation, self.all_shards))
+
+    def get_connection(self):
+        return self.shards[0].get_connection()
+
+    def ping(self):
+        self.fan_out(lambda shard: shard.ping())
+
+    def create_experience(self, experience_data):
+        unique_id = self.generate_unique_id()
+        return self.write_shard(unique_id).create_experience(experience_data, unique_id)
+
+    def create_experiences_bulk(self, experiences, max_attempts=3):
+        """Bulk create across shards: one insert transaction per shard, run in parallel.
+
+        Only the rows of a shard that hit an ID collision are retried.
+        """
+        expires_at = datetime.now() + timedelta(days=app.config['EXPERIENCE_EXPIRY_DAYS'])
+        access_pins = [data.get('custom_pin') or self.shards[0].generate_access_pin() for data in experiences]
+        results = [None] * len(experiences)
+        pending = list(range(len(experiences)))
+
+        for attempt in range(1, max_attempts + 1):
+            by_shard = {}
+            for index, unique_id in zip(pending, self.allocate_unique_ids(len(pending))):
+                by_shard.setdefault(self.write_shard(unique_id), []).append((index, unique_id))
+
+            def insert(item):
+                shard, assigned = item
+                try:
+                    shard.insert_experiences(
+                        [unique_id for _, unique_id in assigned],
+                        [access_pins[index] for index, _ in assigned],
+                        [experiences[index] for index, _ in assigned],
+                        expires_at
+                    )
+                    return assigned, None
+                except DB_INTEGRITY_ERRORS as e:
+                    return assigned, e
+
+            pending = []
+            for assigned, error in self.executor.map(insert, by_shard.items()):
+                if error is None:
+                    for index, unique_id in assigned:
+                        results[index] = (unique_id, access_pins[index])
+                else:
+                    last_error = error
+                    pending.extend(index for index, _ in assigned)
+
+            if not pending:
+                return results
+            logger.warning(f"Unique ID collision during sharded bulk insert (attempt {attempt}), retrying {len(pending)} rows")
+
+        logger.error(f"Sharded bulk insert failed after {max_attempts} attempts: {last_error}")
+        raise last_error
+
+    def allocate_unique_ids(self, count):
+        """Allocate unused IDs, checking each candidate only on the shards that could own it"""
+        allocated = set()
+        for _ in range(DatabaseManager.ID_ALLOCATION_ATTEMPTS):
+            if len(allocated) >= count:
+                break
+            # One draw per missing ID; duplicates just leave the rest to the next round
+            candidates = {self.shards[0].generate_candidate_id() for _ in range(count - len(allocated))} - allocated
+            allocated.update(candidates - self.find_taken_ids(candidates))
+        if len(allocated) < count:
+            raise UniqueIdsExhausted(f"Found only {len(allocated)} of {count} free IDs in {DatabaseManager.ID_ALLOCATION_ATTEMPTS} rounds")
+
+        return list(allocated)
+
+    def find_taken_ids(self, candidates):
+        """Return the candidate IDs that exist on any shard that could own them (one IN query per shard, in parallel)"""
+        by_shard = {}
+        for candidate in candidates:
+            for shard in self.owners(candidate):
+                by_shard.setdefault(shard, set()).add(candidate)
+
+        taken = set()
+        for shard_taken in self.executor.map(lambda item: item[0].find_taken_ids(item[1]), by_shard.items()):
+            taken |= shard_taken
+        return taken
+
+    def generate_unique_id(self):
+        for _ in range(DatabaseManager.ID_ALLOCATION_ATTEMPTS):
+            unique_id = self.shards[0].generate_candidate_id()
+            try:
+                if not any(shard.id_exists(unique_id) for shard in self.owners(unique_id)):
+                    return unique_id
+            except Exception:
+                continue
+        raise UniqueIdsExhausted(f"No free ID found in {DatabaseManager.ID_ALLOCATION_ATTEMPTS} attempts")
+
+    def get_experience(self, unique_id, projection='full'):
+        for shard in self.owners(unique_id):
+            experience = shard.get_experience(unique_id, projection)
+            if experience:
+                return experience
+        return None
+
+    def increment_view_count(self, unique_id, viewer_ip, user_agent):
+        owners = self.owners(unique_id)
+        if len(owners) > 1:
+            # Mid-reshard: count the view wherever the row currently lives
+            owners = [shard for shard in owners if shard.id_exists(unique_id)] or owners
+        owners[0].increment_view_count(unique_id, viewer_ip, user_agent)
+
+    def get_view_stats(self, unique_id, since):
+        for shard in self.owners(unique_id):
+            stats = shard.get_view_stats(unique_id, since)
+            if stats:
+                return stats
+        return []
+
+    def rotate_view_partitions(self):
+        return [name for dropped in self.fan_out(lambda shard: shard.rotate_view_partitions()) for name in dropped]
+
+    def search_experiences(self, query=None, status='all', creator_ip=None, after=None, limit=50):
+        """Merge the newest `limit` matches of every shard (each shard applies the same keyset)"""
+        pages = self.fan_out(lambda shard: shard.search_experiences(query, status, creator_ip, after, limit))
+        # Mid-reshard, copied rows exist on two shards
+        rows = {row['unique_id']: row for page in pages for row in page}
+        return sorted(rows.values(), key=lambda row: (row['created_at'], row['unique_id']), reverse=True)[:limit]
+
+    def get_creator_experience_count(self, creator_ip):
+        # Mid-reshard, rows already copied are counted twice - errs on the side of limiting
+        return sum(self.fan_out(lambda shard: shard.get_creator_experience_count(creator_ip)))
+
+    def purge_expired_experiences(self):
+        return sum(self.fan_out(lambda shard: shard.purge_expired_experiences()))
+
+    def check_replicas(self):
+        self.fan_out(lambda shard: shard.check_replicas())
+
+    def get_target_metrics(self):
+        return [
+            dict(metrics, shard=index)
+            for index, shard in enumerate(self.all_shards)
+            for metrics in shard.get_target_metrics()
+        ]
+
+    def get_pool_stats(self):
+        return [
+            dict(stats, shard=index)
+            for index, shard in enumerate(self.all_shards)
+            for stats in shard.get_pool_stats()
+        ]
+
+# Initialize database manager with error handling
+try:
+    if app.config['DATABASE_SHARD_URLS']:
+        db_manager = ShardedDatabaseManager(app.config['DATABASE_SHARD_URLS'], app.config['DATABASE_SHARD_URLS_NEXT'])
+    else:
+        db_manager = DatabaseManager(app.config['DATABASE_URL'], app.config['DATABASE_REPLICA_URLS'])
+    logger.info("Database initialized successfully")
+except Exception as e:
+    logger.error(f"Database initialization failed: {e}")
+    # Fallback to SQLite if PostgreSQL fails
+    if 'postgresql' in app.config['DATABASE_URL'].lower():
+        logger.info("Falling back to SQLite database")
+        app.config['DATABASE_URL'] = 'valentine_experiences.db'
+        db_manager = DatabaseManager(app.config['DATABASE_URL'])
+    else:
+        raise
+
+class HealthMonitor:
+    """Computes readiness on a background thread so /readyz is answered from memory.
+
+    Each check reports a value and a status of healthy, degraded or unhealthy
+    against the READINESS_* thresholds; the overall status is the worst of
+    them. Other subsystems can register queue-depth and cache-status probes.
+    """
+
+    STATUS_ORDER = ['healthy', 'degraded', 'unhealthy']
+
+    def __init__(self):
+        self.queue_probes = {}  # name -> callable returning current depth
+        self.cache_probes = {}  # name -> callable returning a stats dict
+        self.lock = threading.Lock()
+        self.thread = None
+        self.report = {'status': 'unhealthy', 'checks': {}, 'reason': 'readiness not computed yet'}
+        self.check_started = None  # monotonic time of the check currently running
+        self.last_completed = None
+        self.first_check_done = threading.Event()  # Set once the first check has finished (or failed)
+
+    def register_queue(self, name, depth_probe):
+        self.queue_probes[name] = depth_probe
+
+    def register_cache(self, name, stats_probe):
+        self.cache_probes[name] = stats_probe
+
+    def ensure_started(self):
+        """Start the checker lazily, in the serving process (after any gunicorn fork)"""
+        if self.thread is not None:
+            return
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='readiness-checker', daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Readiness check failed: {e}")
+            self.first_check_done.set()
+            time.sleep(app.config['READINESS_INTERVAL_SECONDS'])
+
+    @staticmethod
+    def grade(value, degraded_at, unhealthy_at, higher_is_worse=True):
+        if value is None:
+            return 'healthy'
+        if higher_is_worse:
+            return 'unhealthy' if value >= unhealthy_at else 'degraded' if value >= degraded_at else 'healthy'
+        return 'unhealthy' if value <= unhealthy_at else 'degraded' if value <= degraded_at else 'healthy'
+
+    def refresh(self):
+        config = app.config
+        self.check_started = time.monotonic()
+        checks = {}
+
+        started = time.perf_counter()
+        try:
+            db_manager.ping()
+            latency_ms = (time.perf_counter() - started) * 1000
+            checks['database'] = {
+                'latency_ms': round(latency_ms, 2),
+                'status': self.grade(latency_ms, config['READINESS_DB_DEGRADED_MS'], config['READINESS_DB_UNHEALTHY_MS'])
+            }
+        except Exception as e:
+            checks['database'] = {'status': 'unhealthy', 'error': str(e)}
+
+        # Re-probe replicas here rather than per request; reads fall back to the primary meanwhile
+        db_manager.check_replicas()
+        replicas = [target for target in db_manager.get_target_metrics() if target['role'] == 'replica']
+        unhealthy_replicas = sum(not target['healthy'] for target in replicas)
+        checks['replicas'] = {
+            'count': len(replicas),
+            'unhealthy': unhealthy_replicas,
+            'status': 'degraded' if unhealthy_replicas else 'healthy'
+        }
+
+        pools = db_manager.get_pool_stats()
+        saturation = max((pool['in_use'] / pool['size'] for pool in pools if pool['size']), default=None)
+        checks['connection_pool'] = {
+            'pools': pools,
+            'saturation': round(saturation, 2) if saturation is not None else None,
+            'status': self.grade(saturation, config['READINESS_POOL_DEGRADED'], config['READINESS_POOL_UNHEALTHY'])
+        }
+
+        usage = shutil.disk_usage(config['UPLOAD_FOLDER'])
+        free_mb = usage.free / (1024 * 1024)
+        checks['upload_disk'] = {
+            'free_mb': round(free_mb),
+            'status': self.grade(free_mb, config['READINESS_DISK_DEGRADED_MB'], config['READINESS_DISK_UNHEALTHY_MB'], higher_is_worse=False)
+        }
+
+        depths = {name: probe() for name, probe in self.queue_probes.items()}
+        deepest = max(depths.values(), default=None)
+        checks['background_queues'] = {
+            'depths': depths,
+            'status': self.grade(deepest, config['READINESS_QUEUE_DEGRADED'], config['READINESS_QUEUE_UNHEALTHY'])
+        }
+
+        checks['caches'] = {
+            'caches': {name: probe() for name, probe in self.cache_probes.items()},
+            'status': 'healthy'
+        }
+
+        status = max((check['status'] for check in checks.values()), key=self.STATUS_ORDER.index)
+        with self.lock:
+            self.report = {'status': status, 'checks': checks, 'checked_at': datetime.now().isoformat()}
+            self.last_completed = time.monotonic()
+            self.check_started = None
+
+    def snapshot(self):
+        """Latest report, downgraded if the checker is stuck (e.g. on a hanging database)"""
+        with self.lock:
+            report = dict(self.report)
+            check_started = self.check_started
+            last_completed = self.last_completed
+
+        now = time.monotonic()
+        stale_after = app.config['READINESS_STALE_SECONDS']
+        if check_started is not None and now - check_started > app.config['READINESS_INTERVAL_SECONDS']:
+            stuck_for = now - check_started
+            report['status'] = 'unhealthy' if stuck_for > stale_after else max(
+                report['status'], 'degraded', key=self.STATUS_ORDER.index)
+            report['reason'] = f'readiness check running for {stuck_for:.1f}s'
+        elif last_completed is not None:
+            report['age_seconds'] = round(now - last_completed, 1)
+        return report
+
+health_monitor = HealthMonitor()
+if isinstance(db_manager, ShardedDatabaseManager):
+    health_monitor.register_queue('shard_fan_out', lambda: db_manager.executor._work_queue.qsize())
+
+class MediaTierManager:
+    """Moves uploaded videos nobody has watched for a while to a cheaper cold tier.
+
+    Hot videos live in UPLOAD_FOLDER and cold ones in MEDIA_COLD_FOLDER (a local
+    directory standing in for object storage), optionally recompressed with
+    ffmpeg on the way. Accesses are noted in memory and flushed to a small
+    node-local SQLite index by a background thread, which also demotes videos
+    idle for MEDIA_COLD_AFTER_DAYS. A cold video is streamed straight from the
+    cold tier and copied back to the hot tier in the background. The cold
+    directory, index and rehydration pool are only created on first use.
+    """
+
+    # Containers re-encoded to H.264 when MEDIA_COLD_RECOMPRESS is on; others are stored as uploaded
+    RECOMPRESSIBLE = {'mp4', 'mov', 'mkv'}
+
+    def __init__(self):
+        self.hot_dir = Path(app.config['UPLOAD_FOLDER'])
+        self.cold_dir = Path(app.config['MEDIA_COLD_FOLDER'])
+        self.lock = threading.Lock()
+        self.thread = None
+        self.pending_access = {}  # filename -> epoch seconds of the latest access, not flushed yet
+        self.rehydrating = set()
+        self.rehydrator = None  # Created with the cold tier storage, see ensure_storage()
+        self.last_demotion_run = None
+        self.tier_sizes = None  # Files and bytes per tier as of the last sweep (not computed per request)
+        self.counters = {
+            'demoted': 0, 'demoted_bytes': 0, 'recompression_saved_bytes': 0,
+            'cold_hits': 0, 'rehydrated': 0, 'rehydrate_total_ms': 0.0, 'rehydrate_last_ms': None
+        }
+
+    def connect(self):
+        return sqlite3.connect(app.config['MEDIA_INDEX_DB'], timeout=10)
+
+    def ensure_storage(self):
+        """Create the cold tier directory, access index and rehydration pool on the first tiering operation"""
+        if self.rehydrator is not None:
+            return
+        with self.lock:
+            if self.rehydrator is None:
+                self.cold_dir.mkdir(parents=True, exist_ok=True)
+                with self.connect() as conn:
+                    conn.execute('CREATE TABLE IF NOT EXISTS media_access (filename TEXT PRIMARY KEY, last_access REAL NOT NULL)')
+                self.rehydrator = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rehydrate')
+
+    def rehydration_backlog(self):
+        return self.rehydrator._work_queue.qsize() if self.rehydrator is not None else 0
+
+    @staticmethod
+    def media_files(directory):
+        """Uploaded videos in a tier directory (skipping in-progress .part/.tmp files)"""
+        if not directory.is_dir():
+            return  # Cold tier not used yet
+        for path in directory.iterdir():
+            if path.suffix.lstrip('.').lower() in app.config['ALLOWED_EXTENSIONS'] and not path.name.startswith('.') and path.is_file():
+                yield path
+
+    def record_access(self, filename):
+        if app.config['MEDIA_TIERING']:
+            with self.lock:
+                self.pending_access[filename] = time.time()
+
+    def flush_access(self):
+        """Write the accesses noted since the last flush to the index, one transaction for all of them"""
+        with self.lock:
+            pending, self.pending_access = self.pending_access, {}
+        if pending:
+            self.ensure_storage()
+            with self.connect() as conn:
+                conn.executemany('''
+                    INSERT INTO media_access (filename, last_access) VALUES (?, ?)
+                    ON CONFLICT (filename) DO UPDATE SET last_access = max(last_access, excluded.last_access)
+                ''', pending.items())
+        return len(pending)
+
+    def cold_path(self, filename):
+        path = self.cold_dir / filename
+        return path if path.is_file() else None
+
+    def schedule_rehydration(self, filename):
+        """Bring a cold video back to the hot tier in the background (once, however many range requests ask)"""
+        with self.lock:
+            self.counters['cold_hits'] += 1
+            if filename in self.rehydrating:
+                return
+            self.rehydrating.add(filename)
+        self.ensure_storage()
+        self.rehydrator.submit(self.rehydrate, filename, time.perf_counter())
+
+    def rehydrate(self, filename, requested_at):
+        cold_path = self.cold_dir / filename
+        temp_path = self.hot_dir / f".{filename}.{secrets.token_hex(4)}.tmp"
+        try:
+            # A plain copy gives the hot file a fresh mtime, so other workers (whose accesses flush
+            # later) do not demote it again right away
+            shutil.copy(cold_path, temp_path)
+            os.replace(temp_path, self.hot_dir / filename)
+            cold_path.unlink(missing_ok=True)
+            self.record_access(filename)
+            elapsed_ms = (time.perf_counter() - requested_at) * 1000
+            with self.lock:
+                self.counters['rehydrated'] += 1
+                self.counters['rehydrate_total_ms'] += elapsed_ms
+                self.counters['rehydrate_last_ms'] = elapsed_ms
+            logger.info(f"Rehydrated {filename} to the hot tier in {elapsed_ms:.0f}ms")
+        except FileNotFoundError:
+            pass  # Rehydrated by another worker already
         except Exception as e:
-            logger.error(f"Failed to get creator count: {e}")
-            return 0
-    
-    def generate_access_pin(self):
-        """Generate a 4-digit access PIN"""
-        return f"{secrets.randbelow(10000):04d}"
-    
-    def generate_unique_id(self):
-        """Generate a unique, URL-safe ID"""
-        while True:
-            # Generate a readable ID with words and numbers
-            adjectives = ['sweet', 'lovely', 'romantic', 'beautiful', 'magical', 'dreamy', 'tender', 'precious']
-            nouns = ['heart', 'love', 'kiss', 'hug', 'smile', 'moment', 'memory', 'feeling']
-            
-            adjective = secrets.choice(adjectives)
-            noun = secrets.choice(nouns)
-            number = secrets.randbelow(9999)
-            
-            unique_id = f"{adjective}-{noun}-{number:04d}"
-            
-            # Check if ID already exists
+            logger.error(f"Failed to rehydrate {filename}: {e}")
+        finally:
+            temp_path.unlink(missing_ok=True)
+            with self.lock:
+                self.rehydrating.discard(filename)
+
+    def recompress(self, source, target):
+        """Re-encode with ffmpeg at MEDIA_COLD_CRF; False (store the original) if that fails or is not smaller"""
+        extension = source.suffix.lstrip('.').lower()
+        if not app.config['MEDIA_COLD_RECOMPRESS'] or extension not in self.RECOMPRESSIBLE:
+            return False
+        command = [
+            FFMPEG_PATH, '-nostdin', '-loglevel', 'error', '-y', '-i', str(source),
+            '-c:v', 'libx264', '-preset', 'veryfast', '-crf', str(app.config['MEDIA_COLD_CRF']),
+            '-c:a', 'aac', '-b:a', '96k'
+        ]
+        if extension != 'mkv':
+            command += ['-movflags', '+faststart']
+        try:
+            subprocess.run(command + [str(target)], check=True, capture_output=True, timeout=1800)
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.warning(f"Recompressing {source.name} failed, storing it unchanged: {e}")
+            return False
+        return target.stat().st_size < source.stat().st_size
+
+    def demote(self, path):
+        """Move one hot video to the cold tier; returns (original_bytes, stored_bytes)"""
+        original_bytes = path.stat().st_size
+        cold_path = self.cold_dir / path.name
+        # Keep the extension last so ffmpeg picks the right container
+        temp_path = self.cold_dir / f".{path.stem}.{secrets.token_hex(4)}.tmp{path.suffix}"
+        try:
+            if not self.recompress(path, temp_path):
+                shutil.copy2(path, temp_path)
+            os.replace(temp_path, cold_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        path.unlink(missing_ok=True)
+        return original_bytes, cold_path.stat().st_size
+
+    def demote_idle(self):
+        """Demote every hot video not accessed for MEDIA_COLD_AFTER_DAYS; returns (videos, bytes freed)"""
+        self.ensure_storage()
+        self.flush_access()
+        cutoff = time.time() - app.config['MEDIA_COLD_AFTER_DAYS'] * 86400
+        with self.connect() as conn:
+            last_access = dict(conn.execute('SELECT filename, last_access FROM media_access'))
+
+        demoted = freed = 0
+        for path in self.media_files(self.hot_dir):
             try:
-                with self.get_connection() as conn:
-                    if self.is_postgres:
-                        cursor = conn.cursor()
-                        cursor.execute('SELECT id FROM valentine_experiences WHERE unique_id = %s', (unique_id,))
-                        if not cursor.fetchone():
-                            return unique_id
-                    else:
-                        cursor = conn.execute('SELECT id FROM valentine_experiences WHERE unique_id = ?', (unique_id,))
-                        if not cursor.fetchone():
-                            return unique_id
-            except Exception:
+                # Never-watched videos count from their upload time
+                if max(last_access.get(path.name, 0), path.stat().st_mtime) >= cutoff:
+                    continue
+                original_bytes, stored_bytes = self.demote(path)
+            except FileNotFoundError:
+                continue  # Demoted by another worker meanwhile
+            except Exception as e:
+                logger.error(f"Failed to move {path.name} to the cold tier: {e}")
                 continue
+            demoted += 1
+            freed += original_bytes
+            with self.lock:
+                self.counters['demoted'] += 1
+                self.counters['demoted_bytes'] += original_bytes
+                self.counters['recompression_saved_bytes'] += original_bytes - stored_bytes
 
-# Initialize database manager with error handling
-try:
-    db_manager = DatabaseManager(app.config['DATABASE_URL'])
-    logger.info("Database initialized successfully")
-except Exception as e:
-    logger.error(f"Database initialization failed: {e}")
-    # Fallback to SQLite if PostgreSQL fails
-    if 'postgresql' in app.config['DATABASE_URL'].lower():
-        logger.info("Falling back to SQLite database")
-        app.config['DATABASE_URL'] = 'valentine_experiences.db'
-        db_manager = DatabaseManager(app.config['DATABASE_URL'])
-    else:
-        raise
+        # Forget videos that are gone from both tiers
+        present = {path.name for directory in (self.hot_dir, self.cold_dir) for path in self.media_files(directory)}
+        gone = [(filename,) for filename in last_access if filename not in present]
+        if gone:
+            with self.connect() as conn:
+                conn.executemany('DELETE FROM media_access WHERE filename = ?', gone)
 
-# Color palettes and themes
-COLOR_PALETTES = {
-    'romantic_pink': {
-        'name': 'Romantic Pink',
-        'primary': '#ff6b9d',
-        'secondary': '#fd79a8',
-        'accent': '#fdcb6e',
-        'background': 'linear-gradient(135deg, #ff9a9e 0%, #fecfef 50%, #fecfef 100%)',
-        'description': 'Classic romantic pink with warm tones'
-    },
-    'sunset_orange': {
-        'name': 'Sunset Orange',
-        'primary': '#ff7675',
-        'secondary': '#fd79a8',
-        'accent': '#fdcb6e',
-        'background': 'linear-gradient(135deg, #ff9a56 0%, #ff6b9d 50%, #c44569 100%)',
-        'description': 'Warm sunset colors with orange and pink'
-    },
-    'purple_dream': {
-        'name': 'Purple Dream',
-        'primary': '#a29bfe',
-        'secondary': '#6c5ce7',
-        'accent': '#fd79a8',
-        'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 50%, #a29bfe 100%)',
-        'description': 'Dreamy purple with mystical vibes'
-    },
-    'ocean_blue': {
-        'name': 'Ocean Blue',
-        'primary': '#74b9ff',
-        'secondary': '#0984e3',
-        'accent': '#00cec9',
-        'background': 'linear-gradient(135deg, #74b9ff 0%, #0984e3 50%, #00cec9 100%)',
-        'description': 'Calming ocean blues and teals'
-    },
-    'forest_green': {
-        'name': 'Forest Green',
-        'primary': '#00b894',
-        'secondary': '#00a085',
-        'accent': '#55a3ff',
-        'background': 'linear-gradient(135deg, #00b894 0%, #55a3ff 50%, #667eea 100%)',
-        'description': 'Natural forest greens with sky blue'
-    },
-    'golden_hour': {
-        'name': 'Golden Hour',
-        'primary': '#fdcb6e',
-        'secondary': '#f39c12',
-        'accent': '#ff7675',
-        'background': 'linear-gradient(135deg, #fdcb6e 0%, #f39c12 50%, #ff7675 100%)',
-        'description': 'Warm golden tones like sunset'
-    },
-    
-    # NEW ENHANCED GRADIENTS
-    'neon_cyberpunk': {
-        'name': 'Neon Cyberpunk',
-        'primary': '#ff0080',
-        'secondary': '#00ffff',
-        'accent': '#ff4081',
-        'background': 'linear-gradient(135deg, #ff0080 0%, #7928ca 30%, #00ffff 70%, #ff4081 100%)',
-        'description': 'Electric neon colors with cyberpunk vibes'
-    },
-    'pastel_rainbow': {
-        'name': 'Pastel Rainbow',
-        'primary': '#ffeaa7',
-        'secondary': '#fab1a0',
-        'accent': '#fd79a8',
-        'background': 'linear-gradient(135deg, #ffeaa7 0%, #fab1a0 25%, #fd79a8 50%, #a29bfe 75%, #74b9ff 100%)',
-        'description': 'Soft pastel rainbow with dreamy colors'
-    },
-    'dark_gothic': {
-        'name': 'Dark Gothic',
-        'primary': '#2d3436',
-        'secondary': '#636e72',
-        'accent': '#e17055',
-        'background': 'linear-gradient(135deg, #2d3436 0%, #636e72 50%, #e17055 100%)',
-        'description': 'Dark romantic with gothic elegance'
-    },
-    'metallic_gold': {
-        'name': 'Metallic Gold',
-        'primary': '#f39c12',
-        'secondary': '#d35400',
-        'accent': '#fdcb6e',
-        'background': 'linear-gradient(135deg, #f39c12 0%, #d35400 30%, #fdcb6e 70%, #f1c40f 100%)',
-        'description': 'Luxurious metallic gold with bronze'
-    },
-    'rose_gold': {
-        'name': 'Rose Gold',
-        'primary': '#e84393',
-        'secondary': '#fd79a8',
-        'accent': '#fdcb6e',
-        'background': 'linear-gradient(135deg, #e84393 0%, #fd79a8 40%, #fdcb6e 80%, #f39c12 100%)',
-        'description': 'Elegant rose gold with warm tones'
-    },
-    'cherry_blossom': {
-        'name': 'Cherry Blossom',
-        'primary': '#fd79a8',
-        'secondary': '#fdcb6e',
-        'accent': '#fab1a0',
-        'background': 'linear-gradient(135deg, #fd79a8 0%, #fdcb6e 30%, #fab1a0 70%, #ffeaa7 100%)',
-        'description': 'Soft cherry blossom pink and cream'
-    },
-    'midnight_aurora': {
-        'name': 'Midnight Aurora',
-        'primary': '#00b894',
-        'secondary': '#00cec9',
-        'accent': '#a29bfe',
-        'background': 'linear-gradient(135deg, #2d3436 0%, #00b894 30%, #00cec9 60%, #a29bfe 100%)',
-        'description': 'Northern lights over midnight sky'
-    }
-}
+        self.refresh_tier_sizes()
+        self.last_demotion_run = time.time()
+        logger.info(f"Moved {demoted} idle videos ({freed / (1024 * 1024):.1f}MB) to the cold tier")
+        return demoted, freed
 
-BACKGROUND_STYLES = {
-    'cloudy': {
-        'name': 'Soft Clouds',
-        'description': 'Gentle floating clouds with soft edges'
-    },
-    'particles': {
-        'name': 'Floating Particles',
-        'description': 'Magical floating particles and sparkles'
-    },
-    'geometric': {
-        'name': 'Geometric Patterns',
-        'description': 'Modern geometric shapes and patterns'
-    },
-    'minimal': {
-        'name': 'Minimal Clean',
-        'description': 'Clean and minimal background'
-    },
-    
-    # ENHANCED PARTICLE BACKGROUNDS
-    'hearts': {
-        'name': 'Heart Rain',
-        'description': 'Falling animated hearts'
-    },
-    'stars': {
-        'name': 'Starfield',
-        'description': 'Twinkling stars with depth'
-    },
-    'petals': {
-        'name': 'Rose Petals',
-        'description': 'Floating rose petals'
-    },
-    'fireflies': {
-        'name': 'Fireflies',
-        'description': 'Glowing dots with trails'
-    },
-    'bubbles': {
-        'name': 'Bubbles',
-        'description': 'Floating soap bubbles'
-    }
-}
+    def refresh_tier_sizes(self):
+        """Count videos and bytes per tier (a stat per file, so only done by the periodic sweep)"""
+        tiers = {}
+        for tier, directory in (('hot', self.hot_dir), ('cold', self.cold_dir)):
+            sizes = []
+            for path in self.media_files(directory):
+                try:
+                    sizes.append(path.stat().st_size)
+                except FileNotFoundError:
+                    pass  # Moved between tiers meanwhile
+            tiers[tier] = {'files': len(sizes), 'bytes': sum(sizes)}
+        tiers['checked_at'] = datetime.now().isoformat()
+        self.tier_sizes = tiers
+        return tiers
+
+    def stats(self):
+        """Videos and bytes per tier as of the last sweep, plus this worker's demotion and rehydration counters"""
+        tiers = self.tier_sizes or {'hot': None, 'cold': None, 'checked_at': None}
+        with self.lock:
+            counters = dict(self.counters)
+            rehydrations_pending = len(self.rehydrating)
+        rehydrated = counters.pop('rehydrated')
+        total_ms = counters.pop('rehydrate_total_ms')
+        last_ms = counters.pop('rehydrate_last_ms')
+        return {
+            'enabled': app.config['MEDIA_TIERING'],
+            'hot': tiers['hot'],
+            'cold': tiers['cold'],
+            'sizes_checked_at': tiers['checked_at'],
+            **counters,
+            'rehydrated': rehydrated,
+            'rehydrations_pending': rehydrations_pending,
+            'avg_rehydrate_ms': round(total_ms / rehydrated, 1) if rehydrated else None,
+            'last_rehydrate_ms': round(last_ms, 1) if last_ms is not None else None,
+            'last_demotion_run': datetime.fromtimestamp(self.last_demotion_run).isoformat() if self.last_demotion_run else None
+        }
+
+    def ensure_started(self):
+        """Start the access flusher / demotion job lazily, in the serving process"""
+        if self.thread is not None or not app.config['MEDIA_TIERING']:
+            return
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='media-tiering', daemon=True)
+                self.thread.start()
+
+    def run(self):
+        next_demotion = time.monotonic()
+        while True:
+            time.sleep(app.config['MEDIA_ACCESS_FLUSH_SECONDS'])
+            try:
+                self.flush_access()
+                if time.monotonic() >= next_demotion:
+                    self.demote_idle()
+                    next_demotion = time.monotonic() + app.config['MEDIA_TIER_INTERVAL_SECONDS']
+            except Exception as e:
+                logger.error(f"Media tiering failed: {e}")
+
+media_tiers = MediaTierManager()
+health_monitor.register_queue('media_rehydration', media_tiers.rehydration_backlog)
 
 # Font styles for typography
 FONT_STYLES = {
@@ -682,6 +1988,475 @@ def validate_custom_pin(pin):
     
     return True
 
+REQUIRED_FIELDS = ['creator_name', 'recipient_name', 'personal_message', 'color_palette']
+
+def build_experience_data(fields, creator_ip, access_pin, metadata, video_filename=None, music_filename=None):
+    """Build the experience_data dict passed to DatabaseManager from submitted form/row fields"""
+    return {
+        'creator_name': fields.get('creator_name').strip(),
+        'recipient_name': fields.get('recipient_name').strip(),
+        'creator_email': fields.get('creator_email', '').strip(),
+        'personal_message': fields.get('personal_message').strip(),
+        'memory_text': fields.get('memory_text', '').strip(),
+        'question_text': fields.get('question_text', f"Will you be my Valentine, {fields.get('recipient_name')}?").strip(),
+        'color_palette': fields.get('color_palette'),
+        'background_style': fields.get('background_style', 'cloudy'),
+        'video_filename': video_filename,
+        'music_filename': music_filename,
+        'custom_css': fields.get('custom_css', '').strip(),
+        'custom_pin': access_pin,  # Pass the custom PIN to the database manager
+        'creator_ip': creator_ip,
+        # NEW ENHANCEMENT FIELDS
+        'font_style': fields.get('font_style', 'sans_modern'),
+        'text_effect': fields.get('text_effect', 'none'),
+        'text_animation': fields.get('text_animation', 'fade_in'),
+        'particle_system': fields.get('particle_system', 'none'),
+        'svg_animation': fields.get('svg_animation', 'none'),
+        'metadata': metadata
+    }
+
+# Quoted strings in creator CSS are never minified; comments are dropped
+CSS_STRING = r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\''
+CSS_STRING_OR_COMMENT = re.compile(rf'({CSS_STRING})|/\*.*?(?:\*/|$)', re.DOTALL)
+# Declarations and at-rules that can run script or pull in other stylesheets
+CSS_BLOCKED = re.compile(
+    r'@(?:import|charset|namespace)[^;{}]*;?|'
+    r'(?:^|(?<=[;{}]))[^;{}]*(?:expression\s*\(|javascript:|vbscript:|-moz-binding|behavior\s*:)[^;{}]*;?',
+    re.IGNORECASE
+)
+# Runs with quoted strings masked as \x00<index>\x00, so braces inside e.g. data: URLs are left alone
+CSS_EMPTY_RULE = re.compile(r'(?:^|(?<=[{};]))[^{};\x00]+\{\}')
+CSS_MASKED_STRING = re.compile(r'\x00(\d+)\x00')
+
+def compile_custom_css(source):
+    """Sanitize and minify creator CSS once at create time.
+
+    Raises ValueError when the input or the compiled result is over the size caps.
+    """
+    if not source or not source.strip():
+        return ''
+    if len(source.encode('utf-8')) > app.config['CUSTOM_CSS_MAX_INPUT_BYTES']:
+        raise ValueError(f"Custom CSS is too large (max {app.config['CUSTOM_CSS_MAX_INPUT_BYTES'] // 1024}KB)")
+
+    css = CSS_STRING_OR_COMMENT.sub(lambda match: match.group(1) or '', source.replace('<', '').replace('\x00', ''))
+    css = CSS_BLOCKED.sub('', css)
+
+    # Minify everything outside quoted strings and drop unbalanced braces
+    compiled = []
+    strings = []
+    depth = 0
+    for index, part in enumerate(re.split(f'({CSS_STRING})', css)):
+        if index % 2:
+            compiled.append(f'\x00{len(strings)}\x00')
+            strings.append(part)
+            continue
+        part = re.sub(r'\s+', ' ', part)
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        part = re.sub(r':\s+', ':', part)
+        part = re.sub(r'([{;][-\w]+)\s+:(?=[^{};]*[;}])', r'\1:', part)  # "color :red" but not "a :hover{"
+        for token in re.split(r'([{}])', part):
+            if token == '{':
+                depth += 1
+            elif token == '}':
+                if depth == 0:
+                    continue
+                depth -= 1
+            compiled.append(token)
+    compiled.append('}' * depth)
+
+    css = ''.join(compiled).replace(';}', '}')
+    # Drop empty rules (repeat for nested at-rules that become empty)
+    previous = None
+    while previous != css:
+        previous, css = css, CSS_EMPTY_RULE.sub('', css)
+    css = CSS_MASKED_STRING.sub(lambda match: strings[int(match.group(1))], css).strip()
+
+    if len(css.encode('utf-8')) > app.config['CUSTOM_CSS_MAX_BYTES']:
+        raise ValueError(f"Custom CSS is too large after minification (max {app.config['CUSTOM_CSS_MAX_BYTES'] // 1024}KB)")
+    return css
+
+@lru_cache(maxsize=1024)
+def custom_stylesheet(custom_css):
+    """Filename of the content-hashed stylesheet for an experience's CSS, written on first use"""
+    if not custom_css:
+        return None
+    try:
+        # A no-op for CSS compiled at create time; sanitizes rows stored before compilation existed
+        compiled = compile_custom_css(custom_css)
+    except ValueError as e:
+        logger.warning(f"Dropping stored custom CSS: {e}")
+        return None
+    if not compiled:
+        return None
+
+    filename = f"{hashlib.sha256(compiled.encode('utf-8')).hexdigest()[:20]}.css"
+    stylesheet_path = Path(app.config['CUSTOM_CSS_FOLDER']) / filename
+    if not stylesheet_path.exists():
+        temp_path = stylesheet_path.with_suffix(f'.{secrets.token_hex(4)}.tmp')
+        temp_path.write_text(compiled, encoding='utf-8')
+        os.replace(temp_path, stylesheet_path)
+    return filename
+
+try:
+    THEME_STYLESHEETS = load_theme_stylesheets(app.config['THEME_FOLDER'])
+except Exception as e:
+    # The experience page falls back to inline theme styles
+    logger.error(f"Error building theme stylesheets: {e}")
+    THEME_STYLESHEETS = {}
+
+@app.template_global()
+def theme_url(palette_key, background_style=None):
+    """URL of the precomputed stylesheet for a palette and background style, or None if there is none"""
+    filename = (THEME_STYLESHEETS.get(f'{palette_key}/{background_style}')
+                or THEME_STYLESHEETS.get(palette_key)
+                or THEME_STYLESHEETS.get('romantic_pink'))
+    return url_for('serve_theme', filename=filename) if filename else None
+
+def is_bulk_request_authorized():
+    """Check the bearer token on bulk API requests (bulk import is off when no token is configured)"""
+    return is_token_authorized('BULK_API_TOKEN')
+
+def is_admin_request_authorized():
+    """Check the bearer token on admin API requests (admin search is off when no token is configured)"""
+    return is_token_authorized('ADMIN_API_TOKEN')
+
+def is_token_authorized(config_key):
+    """Compare the request's bearer token with the token configured under `config_key`"""
+    expected = app.config.get(config_key)
+    if not expected:
+        return False
+    auth_header = request.headers.get('Authorization', '')
+    provided = auth_header[7:] if auth_header.startswith('Bearer ') else ''
+    return hmac.compare_digest(provided.encode(), expected.encode())
+
+def encode_page_cursor(row):
+    """Opaque admin listing cursor holding the keyset of the last row on a page"""
+    keyset = json.dumps([str(row['created_at']), row['unique_id']])
+    return base64.urlsafe_b64encode(keyset.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_page_cursor(cursor):
+    """(created_at, unique_id) from a cursor made by encode_page_cursor; ValueError if it is not one"""
+    try:
+        created_at, unique_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (TypeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(created_at, str) or not isinstance(unique_id, str):
+        raise ValueError('Invalid cursor')
+    return created_at, unique_id
+
+def detect_bulk_format(explicit_format=None, filename=None, mimetype=None):
+    """Work out whether a bulk payload is JSONL or CSV"""
+    if explicit_format in ('jsonl', 'csv'):
+        return explicit_format
+    if filename and '.' in filename:
+        extension = filename.rsplit('.', 1)[1].lower()
+        if extension in ('jsonl', 'ndjson'):
+            return 'jsonl'
+        if extension == 'csv':
+            return 'csv'
+    if mimetype in ('application/x-ndjson', 'application/jsonl', 'application/x-jsonlines'):
+        return 'jsonl'
+    if mimetype == 'text/csv':
+        return 'csv'
+    return None
+
+def iter_bulk_rows(binary_stream, fmt):
+    """Stream rows from a JSONL or CSV byte stream, yielding (row_number, row, error)"""
+    text_stream = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        for row_number, row in enumerate(csv.DictReader(text_stream), 1):
+            yield row_number, row, None
+        return
+
+    for row_number, line in enumerate(text_stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield row_number, None, f'Invalid JSON: {e.msg}'
+
+def validate_bulk_row(row):
+    """Validate one bulk row, returning (fields, access_pin, error)"""
+    if not isinstance(row, dict):
+        return None, None, 'Row must be an object'
+
+    # CSV gives None for short rows, JSON may give numbers - normalise everything to strings
+    fields = {
+        key: '' if value is None else str(value)
+        for key, value in row.items()
+        if key is not None
+    }
+
+    for field in REQUIRED_FIELDS:
+        if not fields.get(field, '').strip():
+            return None, None, f'Missing required field: {field}'
+
+    if fields['color_palette'] not in COLOR_PALETTES:
+        return None, None, f"Unknown color_palette: {fields['color_palette']}"
+    if fields.get('background_style') and fields['background_style'] not in BACKGROUND_STYLES:
+        return None, None, f"Unknown background_style: {fields['background_style']}"
+    if fields.get('font_style') and fields['font_style'] not in FONT_STYLES:
+        return None, None, f"Unknown font_style: {fields['font_style']}"
+
+    try:
+        fields['custom_css'] = compile_custom_css(fields.get('custom_css', ''))
+    except ValueError as e:
+        return None, None, str(e)
+
+    # Drop empty optional columns so the usual defaults apply
+    fields = {key: value for key, value in fields.items() if value != '' or key in REQUIRED_FIELDS}
+
+    custom_pin = fields.pop('custom_pin', '').strip()
+    access_pin = custom_pin if custom_pin and validate_custom_pin(custom_pin) else None
+    return fields, access_pin, None
+
+def bulk_create_experiences(rows, creator_ip, created_from, chunk_size=None, max_rows=None):
+    """Validate streamed rows and create experiences in chunked transactions.
+
+    Yields one result dict per input row, in input order. Only one chunk of
+    rows is held in memory at a time.
+    """
+    chunk_size = chunk_size or app.config['BULK_CHUNK_SIZE']
+    max_rows = max_rows or app.config['BULK_MAX_ROWS']
+    metadata = {'created_from': created_from, 'version': '1.0'}
+    pending = []
+
+    def flush():
+        valid = [item for item in pending if item[1] is not None]
+        created = {}
+        chunk_error = None
+        if valid:
+            try:
+                experiences = [
+                    build_experience_data(fields, creator_ip, access_pin, metadata)
+                    for _, fields, access_pin, _ in valid
+                ]
+                results = db_manager.create_experiences_bulk(experiences)
+                created = {item[0]: result for item, result in zip(valid, results)}
+            except UniqueIdsExhausted as e:
+                logger.error(f"Bulk chunk insert failed: {e}")
+                chunk_error = 'No unique IDs left; try again later'
+            except Exception as e:
+                logger.error(f"Bulk chunk insert failed: {e}")
+                chunk_error = 'Failed to create experience'
+
+        for row_number, fields, _, error in pending:
+            if row_number in created:
+                unique_id, access_pin = created[row_number]
+                # Same as /create: render the static bundle now so views never reach Python
+                if app.config['STATIC_BUNDLES']:
+                    try:
+                        write_experience_bundle(unique_id)
+                    except Exception as e:
+                        logger.error(f"Failed to write static bundle for {unique_id}: {e}")
+                yield {'row': row_number, 'success': True, 'unique_id': unique_id, 'access_pin': access_pin}
+            else:
+                yield {'row': row_number, 'success': False, 'error': error or chunk_error}
+        pending.clear()
+
+    processed = 0
+    for row_number, row, parse_error in rows:
+        if processed >= max_rows:
+            yield {'row': row_number, 'success': False, 'error': f'Row limit of {max_rows} exceeded; remaining rows ignored'}
+            break
+        processed += 1
+
+        if parse_error:
+            pending.append((row_number, None, None, parse_error))
+        else:
+            fields, access_pin, error = validate_bulk_row(row)
+            pending.append((row_number, fields, access_pin, error))
+
+        if len(pending) >= chunk_size:
+            yield from flush()
+
+    yield from flush()
+
+BULK_RESULT_COLUMNS = ['row', 'success', 'unique_id', 'access_pin', 'url', 'error']
+
+def format_bulk_result(result, fmt):
+    """Serialise one bulk result as a JSONL or CSV line"""
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        csv.DictWriter(buffer, fieldnames=BULK_RESULT_COLUMNS).writerow(result)
+        return buffer.getvalue()
+    return json.dumps(result) + '\n'
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+unfurl_cache = TTLCache(app.config['UNFURL_CACHE_SIZE'], app.config['UNFURL_CACHE_SECONDS'])
+health_monitor.register_cache('unfurl', unfurl_cache.stats)
+
+# Link unfurlers / social crawlers that fetch shared /v/<id> links
+CRAWLER_PATTERN = re.compile(
+    r'facebookexternalhit|facebot|twitterbot|slackbot|slack-imgproxy|discordbot|whatsapp|telegrambot|'
+    r'linkedinbot|skypeuripreview|pinterest|redditbot|applebot|embedly|iframely|vkshare|'
+    r'mastodon|bluesky|google-pagerenderer|googlebot|bingbot|yandex|duckduckbot|snapchat|viber|line-poker',
+    re.IGNORECASE
+)
+
+def is_link_crawler():
+    """Check whether the request comes from a link-preview bot rather than a person.
+
+    Only picks the response shape: anyone can send a crawler User-Agent, so
+    crawler responses must never contain more than a stranger may see.
+    """
+    return bool(CRAWLER_PATTERN.search(request.headers.get('User-Agent', '')))
+
+def palette_gradient_stops(color_palette):
+    """Parse a palette's CSS linear-gradient into [(offset 0..1, (r, g, b)), ...]"""
+    stops = [
+        (int(percent) / 100, tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4)))
+        for hex_color, percent in re.findall(r'#([0-9a-fA-F]{6})\s+(\d+)%', color_palette['background'])
+    ]
+    return stops or [(0, (255, 107, 157)), (1, (253, 203, 110))]
+
+# Share cards are per palette and carry no names: every experience is PIN-protected
+PREVIEW_CARD_PATTERN = re.compile(r'^card-[a-z_]+\.(?:png|svg)$')
+
+def preview_palette_key(palette_key):
+    return palette_key if palette_key in COLOR_PALETTES else 'romantic_pink'
+
+def find_preview_card(palette_key):
+    """Filename of an already generated preview card for a palette, if any"""
+    for extension in ('png', 'svg'):
+        filename = f"card-{preview_palette_key(palette_key)}.{extension}"
+        if (Path(app.config['PREVIEW_FOLDER']) / filename).exists():
+            return filename
+    return None
+
+def generate_preview_card(palette_key):
+    """Render the 1200x630 share card for a palette (PNG with Pillow, SVG otherwise)"""
+    palette_key = preview_palette_key(palette_key)
+    color_palette = COLOR_PALETTES[palette_key]
+    stops = palette_gradient_stops(color_palette)
+    title = "A Valentine's message for you"
+    subtitle = "Open it with your PIN"
+    preview_folder = Path(app.config['PREVIEW_FOLDER'])
+
+    if PIL_AVAILABLE:
+        # Paint the 135deg gradient at low resolution and let the resize smooth it
+        small_width, small_height = 60, 32
+        small = Image.new('RGB', (small_width, small_height))
+        for x in range(small_width):
+            for y in range(small_height):
+                position = (x / (small_width - 1) + y / (small_height - 1)) / 2
+                for (start, start_color), (end, end_color) in zip(stops, stops[1:]):
+                    if position <= end:
+                        ratio = (position - start) / (end - start) if end > start else 0
+                        break
+                else:
+                    start_color = end_color = stops[-1][1]
+                    ratio = 0
+                small.putpixel((x, y), tuple(
+                    round(a + (b - a) * max(0, min(1, ratio))) for a, b in zip(start_color, end_color)))
+        card = small.resize((1200, 630), Image.BICUBIC)
+
+        draw = ImageDraw.Draw(card)
+        try:
+            title_font = ImageFont.truetype('DejaVuSans-Bold.ttf', 56)
+            subtitle_font = ImageFont.truetype('DejaVuSans.ttf', 40)
+        except OSError:
+            title_font = subtitle_font = ImageFont.load_default()
+        draw.ellipse((548, 120, 604, 176), fill='white')
+        draw.ellipse((596, 120, 652, 176), fill='white')
+        draw.polygon([(552, 160), (648, 160), (600, 215)], fill='white')
+        outline = color_palette['primary']
+        draw.text((600, 330), title, font=title_font, fill='white', anchor='mm', stroke_width=2, stroke_fill=outline)
+        draw.text((600, 420), subtitle, font=subtitle_font, fill='white', anchor='mm', stroke_width=2, stroke_fill=outline)
+
+        filename = f"card-{palette_key}.png"
+        temp_path = preview_folder / f".{filename}.{secrets.token_hex(4)}.tmp"
+        card.save(temp_path, 'PNG', optimize=True)
+        os.replace(temp_path, preview_folder / filename)
+    else:
+        gradient = ''.join(
+            f'<stop offset="{offset:.2f}" stop-color="#{red:02x}{green:02x}{blue:02x}"/>'
+            for offset, (red, green, blue) in stops
+        )
+        svg = (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="630" viewBox="0 0 1200 630">'
+            f'<defs><linearGradient id="bg" x1="0" y1="0" x2="1" y2="1">{gradient}</linearGradient></defs>'
+            '<rect width="1200" height="630" fill="url(#bg)"/>'
+            '<text x="600" y="190" font-size="96" text-anchor="middle">💕</text>'
+            f'<text x="600" y="345" font-family="sans-serif" font-weight="bold" font-size="56" fill="white" '
+            f'text-anchor="middle">{html.escape(title)}</text>'
+            f'<text x="600" y="430" font-family="sans-serif" font-size="40" fill="white" '
+            f'text-anchor="middle">{html.escape(subtitle)}</text>'
+            '</svg>'
+        )
+        filename = f"card-{palette_key}.svg"
+        temp_path = preview_folder / f".{filename}.{secrets.token_hex(4)}.tmp"
+        temp_path.write_text(svg, encoding='utf-8')
+        os.replace(temp_path, preview_folder / filename)
+
+    logger.info(f"Generated preview card {filename}")
+    return filename
+
+def purge_legacy_preview_cards():
+    """Delete per-experience share cards from before cards were per palette (they carry names)"""
+    removed = 0
+    for path in Path(app.config['PREVIEW_FOLDER']).iterdir():
+        if path.is_file() and not PREVIEW_CARD_PATTERN.match(path.name) and not path.name.startswith('.'):
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+def unfurl_response(unique_id):
+    """Tiny OG-only page for link crawlers, cached per experience so repeat crawls skip the database"""
+    page = unfurl_cache.get(unique_id)
+    if page is None:
+        experience = db_manager.get_experience(unique_id, 'preview')
+        if not experience:
+            return render_template('error.html',
+                                 error_code=404,
+                                 error_message="This Valentine's experience doesn't exist or has expired 💔"), 404
+
+        # Crawlers are identified by User-Agent alone, so the page and card name nobody
+        preview_filename = find_preview_card(experience.color_palette) or generate_preview_card(experience.color_palette)
+        color_palette = COLOR_PALETTES.get(experience.color_palette, COLOR_PALETTES['romantic_pink'])
+        page = render_template('og_preview.html',
+                             color_palette=color_palette,
+                             page_url=url_for('view_experience', unique_id=unique_id, _external=True),
+                             image_url=url_for('serve_preview', filename=preview_filename, _external=True))
+        unfurl_cache.set(unique_id, page)
+
+    response = Response(page, mimetype='text/html')
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['UNFURL_CACHE_SECONDS']
+    return response
+
 @app.errorhandler(404)
 def not_found_error(error):
     """Handle 404 errors gracefully"""
@@ -716,6 +2491,196 @@ def index():
         logger.error(f"Error in main route: {e}")
         return f"Error loading page: {str(e)}", 500
 
+def bundle_view_token(unique_id):
+    """Token that lets a decrypted static bundle report its view"""
+    return hmac.new(app.config['SECRET_KEY'].encode(), f"view:{unique_id}".encode(), hashlib.sha256).hexdigest()
+
+def write_experience_bundle(unique_id):
+    """Render an experience once into a static page whose content is encrypted with a key derived from its PIN"""
+    experience = db_manager.get_experience(unique_id)
+    if not experience:
+        return None
+
+    color_palette = COLOR_PALETTES.get(experience['color_palette'], COLOR_PALETTES['romantic_pink'])
+    page = render_template('experience.html',
+                         experience=experience,
+                         color_palette=color_palette,
+                         unique_id=unique_id,
+                         custom_stylesheet=custom_stylesheet(experience['custom_css']),
+                         view_beacon={'url': url_for('record_view_beacon', unique_id=unique_id),
+                                      'token': bundle_view_token(unique_id)})
+
+    # PBKDF2-SHA256 -> AES-256-GCM, mirrored by WebCrypto in static/js/experience-bundle.js
+    salt = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(12)
+    iterations = app.config['BUNDLE_KDF_ITERATIONS']
+    key = hashlib.pbkdf2_hmac('sha256', experience['access_pin'].encode(), salt, iterations)
+    ciphertext = AESGCM(key).encrypt(nonce, page.encode('utf-8'), unique_id.encode())
+
+    expires_at = experience['expires_at']
+    if isinstance(expires_at, str):
+        expires_at = datetime.fromisoformat(expires_at)
+    bundle = {
+        'iterations': iterations,
+        'salt': base64.b64encode(salt).decode(),
+        'nonce': base64.b64encode(nonce).decode(),
+        'ciphertext': base64.b64encode(ciphertext).decode(),
+        'expires_at': int(expires_at.timestamp() * 1000) if expires_at else None
+    }
+
+    # Write-then-rename so the front proxy never serves a partial file
+    bundle_path = Path(app.config['BUNDLE_FOLDER']) / f"{unique_id}.html"
+    temp_path = bundle_path.with_suffix('.html.tmp')
+    temp_path.write_text(render_template('pin_entry.html', unique_id=unique_id, bundle=bundle), encoding='utf-8')
+    os.replace(temp_path, bundle_path)
+    logger.info(f"Wrote static bundle for {unique_id}")
+    return bundle_path
+
+def purge_orphaned_bundles(batch_size=500):
+    """Delete static bundles whose experience no longer exists (e.g. purged after expiry)"""
+    bundle_paths = {path.stem: path for path in Path(app.config['BUNDLE_FOLDER']).glob('*.html')}
+    unique_ids = list(bundle_paths)
+    removed = 0
+    for start in range(0, len(unique_ids), batch_size):
+        batch = set(unique_ids[start:start + batch_size])
+        for unique_id in batch - db_manager.find_taken_ids(batch):
+            bundle_paths[unique_id].unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+class UploadRejected(Exception):
+    """A /create submission refused while its body is still streaming in"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+# Container family per extension, checked against the file's magic bytes
+VIDEO_CONTAINERS = {'mp4': 'iso', 'mov': 'iso', 'mkv': 'matroska', 'webm': 'matroska', 'avi': 'avi'}
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+def sniff_video_container(head):
+    """Container family from the first bytes of a file: 'iso' (MP4/MOV), 'matroska' (MKV/WebM), 'avi' or None"""
+    if head[4:8] in (b'ftyp', b'moov', b'mdat', b'wide', b'free', b'skip'):
+        return 'iso'
+    if head[:4] == b'\x1a\x45\xdf\xa3':
+        return 'matroska'
+    if head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+        return 'avi'
+    return None
+
+def validate_create_fields(fields):
+    """Validate /create text fields, returning the compiled custom CSS (raises UploadRejected)"""
+    for field in REQUIRED_FIELDS:
+        if not fields.get(field):
+            raise UploadRejected(f'Missing required field: {field}')
+    try:
+        # Compile custom CSS once here rather than shipping it raw with every view
+        return compile_custom_css(fields.get('custom_css', ''))
+    except ValueError as e:
+        raise UploadRejected(str(e))
+
+def stream_create_form():
+    """Parse a multipart /create body chunk by chunk.
+
+    When text fields arrive before the video part (as the form and generator.js send them), they are
+    validated before any of it is read, so a blank required field is rejected at once; Content-Length
+    is checked against the video's per-type cap. Bodies that start with the video are accepted and
+    validated once the body is complete, as are fields that arrive after the video. The video's
+    magic bytes are checked against its extension on the first chunk and the cap is enforced again
+    while it is written to disk. Returns (fields, video_filename, custom_css); raises UploadRejected.
+    """
+    boundary = request.mimetype_params.get('boundary')
+    if not boundary:
+        raise UploadRejected('Missing multipart boundary')
+
+    decoder = MultipartDecoder(boundary.encode('latin-1'), max_form_memory_size=app.config['CREATE_FORM_MAX_BYTES'])
+    fields = {}
+    custom_css = None
+    validated_fields = None  # Field names seen by the early validation
+    form_bytes = 0
+    part = None
+    buffer = []
+    video = None  # {'path', 'temp_path', 'file', 'head', 'size', 'limit', 'container'}
+
+    def read_chunks():
+        while True:
+            chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+            yield chunk or None
+            if not chunk:
+                return
+
+    try:
+        for chunk in read_chunks():
+            decoder.receive_data(chunk)
+            event = decoder.next_event()
+            while not isinstance(event, (Epilogue, NeedData)):
+                if isinstance(event, Field):
+                    part, buffer = event, []
+                elif isinstance(event, File):
+                    part = event
+                    if event.name == 'video_file' and event.filename and video is None:
+                        # Text fields came first: reject now rather than after reading the whole video.
+                        # Video-first bodies are validated at the end instead.
+                        if fields:
+                            custom_css = validate_create_fields(fields)
+                            validated_fields = set(fields)
+                        if not allowed_file(event.filename):
+                            raise UploadRejected('Unsupported video format. Please upload MP4, MOV, AVI, MKV or WebM')
+                        extension = event.filename.rsplit('.', 1)[1].lower()
+                        limit = app.config['UPLOAD_MAX_BYTES'][extension]
+                        if (request.content_length or 0) > limit + app.config['CREATE_FORM_MAX_BYTES']:
+                            raise UploadRejected(f"Video too large (max {limit // (1024 * 1024)}MB for this format)", 413)
+                        unique_filename = f"{secrets.token_hex(8)}_{secure_filename(event.filename)}"
+                        video_path = Path(app.config['UPLOAD_FOLDER']) / unique_filename
+                        temp_path = video_path.with_name(f"{unique_filename}.part")
+                        video = {'path': video_path, 'temp_path': temp_path, 'file': open(temp_path, 'wb'),
+                                 'head': b'', 'size': 0, 'limit': limit,
+                                 'container': VIDEO_CONTAINERS[extension]}
+                    else:
+                        part = None  # Unknown or empty file parts are skipped
+                elif isinstance(event, Data) and isinstance(part, Field):
+                    form_bytes += len(event.data)
+                    if form_bytes > app.config['CREATE_FORM_MAX_BYTES']:
+                        raise UploadRejected('Form data too large', 413)
+                    buffer.append(event.data)
+                    if not event.more_data:
+                        fields.setdefault(part.name, b''.join(buffer).decode('utf-8', 'replace'))
+                elif isinstance(event, Data) and isinstance(part, File):
+                    data = event.data
+                    video['size'] += len(data)
+                    if video['size'] > video['limit']:
+                        raise UploadRejected(f"Video too large (max {video['limit'] // (1024 * 1024)}MB for this format)", 413)
+                    if video['head'] is not None:
+                        # Hold back writes until there are enough bytes to identify the container
+                        video['head'] += data
+                        data = b''
+                        if len(video['head']) >= 12 or not event.more_data:
+                            if sniff_video_container(video['head']) != video['container']:
+                                raise UploadRejected("The uploaded file doesn't look like a video in the format its name says")
+                            data, video['head'] = video['head'], None
+                    video['file'].write(data)
+                    if not event.more_data:
+                        video['file'].close()
+                event = decoder.next_event()
+
+        if custom_css is None or set(fields) != validated_fields:
+            custom_css = validate_create_fields(fields)  # Fields (also) arrived after the video
+    except Exception as e:
+        if video:
+            video['file'].close()
+            video['temp_path'].unlink(missing_ok=True)
+        if isinstance(e, ValueError):  # Raised by the decoder on a broken body
+            raise UploadRejected(f'Malformed upload: {e}') from e
+        raise
+
+    if not video:
+        return fields, None, custom_css
+    video['file'].close()
+    os.replace(video['temp_path'], video['path'])
+    logger.info(f"Video uploaded: {video['path'].name} ({video['size']} bytes)")
+    return fields, video['path'].name, custom_css
+
 @app.route('/create', methods=['POST'])
 def create_experience():
     """Create a new Valentine's Day experience"""
@@ -728,31 +2693,31 @@ def create_experience():
                 'error': 'Rate limit exceeded. Please try again tomorrow.'
             }), 429
         
-        # Validate required fields
-        required_fields = ['creator_name', 'recipient_name', 'personal_message', 'color_palette']
-        for field in required_fields:
-            if not request.form.get(field):
-                return jsonify({
-                    'success': False,
-                    'error': f'Missing required field: {field}'
-                }), 400
-        
-        # Handle file uploads
-        video_filename = None
-        music_filename = None
+        # Reject oversized bodies from the headers alone, before any of the body is read
+        max_body = max(app.config['UPLOAD_MAX_BYTES'].values()) + app.config['CREATE_FORM_MAX_BYTES']
+        if request.content_length is not None and request.content_length > min(max_body, app.config['MAX_CONTENT_LENGTH']):
+            raise RequestEntityTooLarge()
         
-        if 'video_file' in request.files:
-            video_file = request.files['video_file']
-            if video_file and video_file.filename and allowed_file(video_file.filename):
-                filename = secure_filename(video_file.filename)
-                unique_filename = f"{secrets.token_hex(8)}_{filename}"
-                video_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-                video_file.save(video_path)
-                video_filename = unique_filename
-                logger.info(f"Video uploaded: {unique_filename}")
+        # Parse the body incrementally: fields are validated before the video part is consumed,
+        # and the video is sniffed and size-capped while it streams to disk
+        try:
+            if request.mimetype == 'multipart/form-data':
+                fields, video_filename, custom_css = stream_create_form()
+            else:
+                if (request.content_length or 0) > app.config['CREATE_FORM_MAX_BYTES']:
+                    raise UploadRejected('Form data too large', 413)
+                fields, video_filename = request.form.to_dict(), None
+                custom_css = validate_create_fields(fields)
+        except UploadRejected as e:
+            logger.warning(f"Rejected /create upload from {client_ip}: {e}")
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), e.status_code
+        music_filename = None
         
         # Handle custom PIN
-        custom_pin = request.form.get('custom_pin', '').strip()
+        custom_pin = fields.get('custom_pin', '').strip()
         if custom_pin and validate_custom_pin(custom_pin):
             access_pin = custom_pin
             logger.info(f"Using custom PIN: {access_pin}")
@@ -762,36 +2727,37 @@ def create_experience():
                 logger.warning(f"Invalid custom PIN provided: {custom_pin}, using auto-generated PIN")
         
         # Prepare experience data
-        experience_data = {
-            'creator_name': request.form.get('creator_name').strip(),
-            'recipient_name': request.form.get('recipient_name').strip(),
-            'creator_email': request.form.get('creator_email', '').strip(),
-            'personal_message': request.form.get('personal_message').strip(),
-            'memory_text': request.form.get('memory_text', '').strip(),
-            'question_text': request.form.get('question_text', f"Will you be my Valentine, {request.form.get('recipient_name')}?").strip(),
-            'color_palette': request.form.get('color_palette'),
-            'background_style': request.form.get('background_style', 'cloudy'),
-            'video_filename': video_filename,
-            'music_filename': music_filename,
-            'custom_css': request.form.get('custom_css', '').strip(),
-            'custom_pin': access_pin,  # Pass the custom PIN to the database manager
-            'creator_ip': client_ip,
-            # NEW ENHANCEMENT FIELDS
-            'font_style': request.form.get('font_style', 'sans_modern'),
-            'text_effect': request.form.get('text_effect', 'none'),
-            'text_animation': request.form.get('text_animation', 'fade_in'),
-            'particle_system': request.form.get('particle_system', 'none'),
-            'svg_animation': request.form.get('svg_animation', 'none'),
-            'metadata': {
+        experience_data = build_experience_data(
+            fields,
+            client_ip,
+            access_pin,
+            metadata={
                 'user_agent': request.headers.get('User-Agent', ''),
                 'created_from': 'web_form',
                 'version': '1.0'
-            }
-        }
+            },
+            video_filename=video_filename,
+            music_filename=music_filename
+        )
+        experience_data['custom_css'] = custom_css
+        custom_stylesheet(custom_css)
         
         # Create the experience
         unique_id, access_pin = db_manager.create_experience(experience_data)
         
+        # Make sure the palette's share preview card exists so the first unfurl is instant
+        try:
+            find_preview_card(experience_data['color_palette']) or generate_preview_card(experience_data['color_palette'])
+        except Exception as e:
+            logger.error(f"Failed to generate preview card for {unique_id}: {e}")
+        
+        # Static bundle mode: render the experience once so views never reach Python
+        if app.config['STATIC_BUNDLES']:
+            try:
+                write_experience_bundle(unique_id)
+            except Exception as e:
+                logger.error(f"Failed to write static bundle for {unique_id}: {e}")
+        
         # Generate the shareable URL
         experience_url = url_for('view_experience', unique_id=unique_id, _external=True)
         
@@ -805,6 +2771,14 @@ def create_experience():
             'message': 'Your Valentine\'s Day experience has been created successfully!'
         })
         
+    except RequestEntityTooLarge:
+        raise
+    except UniqueIdsExhausted as e:
+        logger.error(f"Failed to create experience: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'No experience links are available right now. Please try again later.'
+        }), 503
     except Exception as e:
         logger.error(f"Failed to create experience: {e}")
         logger.error(traceback.format_exc())
@@ -813,12 +2787,99 @@ def create_experience():
             'error': 'Failed to create experience. Please try again.'
         }), 500
 
+@app.route('/api/admin/experiences')
+def admin_search_experiences():
+    """Find experiences for support staff: full-text search, status and IP filters, newest first"""
+    if not is_admin_request_authorized():
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    status = request.args.get('status', 'all')
+    if status not in ('all', 'active', 'expired'):
+        return jsonify({'success': False, 'error': 'status must be all, active or expired'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), app.config['ADMIN_MAX_PAGE_SIZE'])
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit must be a number'}), 400
+    try:
+        after = decode_page_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        # One extra row tells whether there is a next page
+        rows = db_manager.search_experiences(request.args.get('q'), status, request.args.get('ip'), after, limit + 1)
+    except Exception as e:
+        logger.error(f"Admin search failed: {e}")
+        return jsonify({'success': False, 'error': 'Search failed'}), 500
+
+    page = rows[:limit]
+    return jsonify({
+        'success': True,
+        'experiences': [
+            dict(row, is_active=bool(row['is_active']),
+                 **{column: str(row[column]) for column in ('created_at', 'expires_at') if row[column] is not None})
+            for row in page
+        ],
+        'next_cursor': encode_page_cursor(page[-1]) if len(rows) > limit else None
+    })
+
+@app.route('/api/bulk/create', methods=['POST'])
+def bulk_create():
+    """Create many experiences from a JSONL or CSV upload, streaming back one result per row"""
+    if not is_bulk_request_authorized():
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    # Accept either a multipart upload ("file") or the raw request body
+    upload = request.files.get('file') if request.mimetype == 'multipart/form-data' else None
+    input_format = detect_bulk_format(
+        request.args.get('format'),
+        upload.filename if upload else None,
+        request.mimetype
+    )
+    if not input_format:
+        return jsonify({
+            'success': False,
+            'error': 'Unsupported format. Send JSONL or CSV (use ?format=jsonl|csv if unsure).'
+        }), 400
+
+    output_format = detect_bulk_format(request.args.get('output')) or input_format
+    rows = iter_bulk_rows(upload.stream if upload else request.stream, input_format)
+    client_ip = get_client_ip()
+    logger.info(f"Bulk import started from {client_ip} ({input_format} -> {output_format})")
+
+    def generate():
+        if output_format == 'csv':
+            yield ','.join(BULK_RESULT_COLUMNS) + '\r\n'
+        for result in bulk_create_experiences(rows, client_ip, 'bulk_api'):
+            if result['success']:
+                result['url'] = url_for('view_experience', unique_id=result['unique_id'], _external=True)
+            yield format_bulk_result(result, output_format)
+
+    mimetype = 'text/csv' if output_format == 'csv' else 'application/x-ndjson'
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=bulk_results.{output_format}'
+    return response
+
 @app.route('/v/<unique_id>')
 def view_experience(unique_id):
     """View a specific Valentine's Day experience - requires PIN"""
     try:
-        # Get the experience
-        experience = db_manager.get_experience(unique_id)
+        # Link-preview bots get a cached OG-only page instead of the PIN form
+        if not request.args.get('pin') and is_link_crawler():
+            return unfurl_response(unique_id)
+        
+        # Get the experience - just the PIN until one is provided
+        provided_pin = request.args.get('pin')
+        
+        # Static bundle mode: the PIN form decrypts the experience in the browser
+        if app.config['STATIC_BUNDLES'] and not provided_pin:
+            if (Path(app.config['BUNDLE_FOLDER']) / f"{unique_id}.html").exists():
+                response = send_from_directory(app.config['BUNDLE_FOLDER'], f"{unique_id}.html",
+                                               max_age=app.config['BUNDLE_CACHE_SECONDS'])
+                response.cache_control.public = True
+                return response
+        
+        experience = db_manager.get_experience(unique_id, 'view' if provided_pin else 'pin')
         if not experience:
             logger.warning(f"Experience not found: {unique_id}")
             return render_template('error.html',
@@ -826,7 +2887,6 @@ def view_experience(unique_id):
                                  error_message="This Valentine's experience doesn't exist or has expired 💔"), 404
         
         # Check if PIN is provided
-        provided_pin = request.args.get('pin')
         if not provided_pin:
             # Show PIN entry page
             return render_template('pin_entry.html', unique_id=unique_id)
@@ -834,9 +2894,10 @@ def view_experience(unique_id):
         # Verify PIN
         if provided_pin != experience['access_pin']:
             logger.warning(f"Invalid PIN attempt for experience {unique_id}: {provided_pin}")
+            # no-store keeps the service worker (and any shared cache) from keeping the wrong-PIN URL
             return render_template('pin_entry.html', 
                                  unique_id=unique_id, 
-                                 error="Invalid PIN. Please try again.")
+                                 error="Invalid PIN. Please try again."), 200, {'Cache-Control': 'no-store'}
         
         # PIN is correct, show the experience
         # Increment view count
@@ -852,7 +2913,8 @@ def view_experience(unique_id):
         return render_template('experience.html',
                              experience=experience,
                              color_palette=color_palette,
-                             unique_id=unique_id)
+                             unique_id=unique_id,
+                             custom_stylesheet=custom_stylesheet(experience['custom_css']))
         
     except Exception as e:
         logger.error(f"Error viewing experience {unique_id}: {e}")
@@ -868,31 +2930,111 @@ def serve_upload(filename):
         if '..' in filename or '/' in filename:
             abort(403)
         
-        upload_path = Path(app.config['UPLOAD_FOLDER']) / filename
-        if not upload_path.exists():
-            abort(404)
-        
         # Set proper MIME type
         mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
         
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename, mimetype=mimetype)
+        upload_path = Path(app.config['UPLOAD_FOLDER']) / filename
+        if upload_path.exists():
+            media_tiers.record_access(filename)
+            return send_from_directory(app.config['UPLOAD_FOLDER'], filename, mimetype=mimetype)
+        
+        # Idle videos live in the cold tier: stream from there while a copy moves back
+        cold_path = media_tiers.cold_path(filename)
+        if cold_path is None:
+            abort(404)
+        media_tiers.record_access(filename)
+        # The response holds the cold file open, so rehydration may move it right away
+        response = send_from_directory(cold_path.parent, filename, mimetype=mimetype)
+        media_tiers.schedule_rehydration(filename)
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error serving upload {filename}: {e}")
         abort(500)
 
+@app.route('/previews/<filename>')
+def serve_preview(filename):
+    """Serve pre-generated share preview cards with long-lived caching"""
+    # Only the nameless per-palette cards; older per-experience cards showed names without a PIN
+    if not PREVIEW_CARD_PATTERN.match(filename):
+        abort(404)
+    if not (Path(app.config['PREVIEW_FOLDER']) / filename).exists():
+        abort(404)
+    response = send_from_directory(app.config['PREVIEW_FOLDER'], filename, max_age=365 * 24 * 3600)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+@app.route('/sw.js')
+def service_worker():
+    """Service worker for repeat opens of an experience (served from the root so it can control /v/ and /uploads/)"""
+    script = Path(app.static_folder, 'js', 'service-worker.js').read_text(encoding='utf-8')
+    precache_urls = [asset_url(filename) for filename in EXPERIENCE_ASSETS]
+    response = Response(
+        f"const ASSET_VERSION = {json.dumps(ASSET_VERSION)};\n"
+        f"const PRECACHE_URLS = {json.dumps(precache_urls)};\n\n{script}",
+        mimetype='application/javascript'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/custom-css/<filename>')
+def serve_custom_css(filename):
+    """Serve compiled creator stylesheets; names are content hashes so they never change"""
+    if '..' in filename or '/' in filename:
+        abort(403)
+    if not (Path(app.config['CUSTOM_CSS_FOLDER']) / filename).exists():
+        abort(404)
+    response = send_from_directory(app.config['CUSTOM_CSS_FOLDER'], filename,
+                                   mimetype='text/css', max_age=365 * 24 * 3600)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+@app.route('/themes/<filename>')
+def serve_theme(filename):
+    """Serve precomputed palette stylesheets; names are content hashes so they never change"""
+    if '..' in filename or '/' in filename or not filename.endswith('.css'):
+        abort(403)
+    if not (Path(app.config['THEME_FOLDER']) / filename).exists():
+        abort(404)
+    response = send_from_directory(app.config['THEME_FOLDER'], filename,
+                                   mimetype='text/css', max_age=365 * 24 * 3600)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+@app.route('/api/views/<unique_id>', methods=['POST'])
+def record_view_beacon(unique_id):
+    """Count a view of a static bundle (sent with navigator.sendBeacon after a successful decrypt)"""
+    try:
+        token = request.get_data(as_text=True)[:128]
+        if not hmac.compare_digest(token, bundle_view_token(unique_id)):
+            return jsonify({'error': 'Invalid view token'}), 403
+        
+        db_manager.increment_view_count(unique_id, get_client_ip(), request.headers.get('User-Agent', ''))
+        return '', 204
+        
+    except Exception as e:
+        logger.error(f"Error recording view for {unique_id}: {e}")
+        return jsonify({'error': 'Failed to record view'}), 500
+
 @app.route('/api/stats/<unique_id>')
 def get_stats(unique_id):
     """Get basic stats for an experience (for creators)"""
     try:
-        experience = db_manager.get_experience(unique_id)
+        experience = db_manager.get_experience(unique_id, 'stats')
         if not experience:
             return jsonify({'error': 'Experience not found'}), 404
         
+        since = view_clock() - timedelta(days=app.config['VIEW_STATS_DAYS'])
         return jsonify({
             'view_count': experience['view_count'],
             'created_at': experience['created_at'],
-            'recipient_name': experience['recipient_name']
+            'recipient_name': experience['recipient_name'],
+            'daily_views': db_manager.get_view_stats(unique_id, since)
         })
         
     except Exception as e:
@@ -901,30 +3043,46 @@ def get_stats(unique_id):
 
 @app.after_request
 def add_header(response):
-    """Add headers to disable caching for development"""
-    if app.debug or app.config.get('TEMPLATES_AUTO_RELOAD'):
+    """Add headers to disable caching for development (responses marked public keep their caching)"""
+    if (app.debug or app.config.get('TEMPLATES_AUTO_RELOAD')) and not response.cache_control.public:
         response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
         response.headers['Pragma'] = 'no-cache'
         response.headers['Expires'] = '0'
     return response
 
+@app.before_request
+def start_background_services():
+    """Background threads start on the first request so they live in the serving worker"""
+    health_monitor.ensure_started()
+    media_tiers.ensure_started()
+
+@app.route('/livez')
+def liveness_check():
+    """Liveness probe - the process is up and serving; deliberately does no I/O"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/readyz')
+def readiness_check():
+    """Readiness probe served from the background checker's latest report"""
+    # The probe may be the worker's first request: let the checker it just started finish one pass
+    health_monitor.first_check_done.wait(app.config['READINESS_STARTUP_WAIT_SECONDS'])
+    report = health_monitor.snapshot()
+    report['timestamp'] = datetime.now().isoformat()
+    return jsonify(report), 503 if report['status'] == 'unhealthy' else 200
+
 @app.route('/health')
 def health_check():
     """Health check endpoint for monitoring"""
     try:
-        # Test database connection
-        with db_manager.get_connection() as conn:
-            if db_manager.is_postgres:
-                cursor = conn.cursor()
-                cursor.execute('SELECT 1')
-                cursor.fetchone()
-            else:
-                conn.execute('SELECT 1').fetchone()
+        # Test database connection (every shard when sharded); replica health comes from the readiness checker
+        db_manager.ping()
         
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
-            'version': '1.0.0'
+            'version': '1.0.0',
+            'database_targets': db_manager.get_target_metrics(),
+            'media_storage': media_tiers.stats()
         })
         
     except Exception as e:
@@ -943,6 +3101,13 @@ def test_particles():
     except Exception as e:
         return f"Error loading test page: {str(e)}", 500
 
+# Load templates at worker boot so the first request of each worker does not pay for it
+if app.config['TEMPLATE_WARMUP']:
+    try:
+        warm_templates()
+    except Exception as e:
+        logger.error(f"Template warm-up failed: {e}")
+
 if __name__ == '__main__':
     try:
         logger.info("Starting Valentine's Day Experience Generator")
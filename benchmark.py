@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmarks
+Micro and macro benchmarks for the hot paths of the Valentine Generator
+
+Usage:
+    python benchmark.py row-decode --rows 5000
+    python benchmark.py shards --shard-counts 1,2,4,8 --workers 8
+    python benchmark.py custom-css --css-kb 4,16,60
+    python benchmark.py first-request --workers 4
+    python benchmark.py admin-search --rows 1000000
+"""
+
+import os
+import sys
+import json
+import time
+import gzip
+import random
+import shutil
+import statistics
+import sqlite3
+import logging
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# Keep benchmark data out of the real database
+BENCH_DIR = tempfile.mkdtemp(prefix='valentine-bench-')
+os.environ.setdefault('DATABASE_URL', os.path.join(BENCH_DIR, 'bench.db'))
+os.environ.setdefault('TEMPLATE_CACHE_DIR', os.path.join(BENCH_DIR, 'jinja_cache'))
+
+SAMPLE_EXPERIENCE = {
+    'creator_name': 'Alex',
+    'recipient_name': 'Sam',
+    'creator_email': 'alex@example.com',
+    'personal_message': 'Every day with you is my favourite day. ' * 8,
+    'memory_text': 'That rainy afternoon in the bookshop.',
+    'question_text': 'Will you be my Valentine, Sam?',
+    'color_palette': 'romantic_pink',
+    'background_style': 'hearts',
+    'custom_css': '.message-text { letter-spacing: 0.02em; }',
+    'creator_ip': '203.0.113.7',
+    'metadata': {'user_agent': 'Mozilla/5.0 (benchmark)', 'created_from': 'benchmark', 'version': '1.0'}
+}
+
+def report(label, seconds, count):
+    print(f"   {label:<42} {seconds / count * 1e6:9.2f} µs/op")
+
+def seed(db_manager, rows):
+    """Insert `rows` sample experiences and return their IDs"""
+    unique_ids = []
+    chunk = 500
+    for start in range(0, rows, chunk):
+        batch = [dict(SAMPLE_EXPERIENCE) for _ in range(min(chunk, rows - start))]
+        unique_ids.extend(unique_id for unique_id, _ in db_manager.create_experiences_bulk(batch))
+    return unique_ids
+
+def bench_row_decode(args):
+    """Row decode cost and memory per cached record: SELECT * + dict + json.loads vs projections + ExperienceRecord"""
+    from app import db_manager, ExperienceRecord, EXPERIENCE_PROJECTIONS
+
+    print(f"📦 Seeding {args.rows} experiences...")
+    unique_ids = seed(db_manager, args.rows)
+    lookups = [random.choice(unique_ids) for _ in range(args.lookups)]
+
+    conn = sqlite3.connect(db_manager.db_url)
+    conn.row_factory = sqlite3.Row
+    legacy_rows = [
+        conn.execute('SELECT * FROM valentine_experiences WHERE unique_id = ?', (unique_id,)).fetchone()
+        for unique_id in lookups
+    ]
+    conn.row_factory = None
+    projected_rows = {
+        projection: [
+            conn.execute(db_manager.sql[f'experience_by_id:{projection}'], (unique_id,)).fetchone()
+            for unique_id in lookups
+        ]
+        for projection in ('full', 'view', 'stats')
+    }
+
+    def legacy_decode(row):
+        exp_dict = dict(row)
+        if exp_dict['metadata']:
+            exp_dict['metadata'] = json.loads(exp_dict['metadata'])
+        return exp_dict
+
+    print("⏱️  Decode cost per row")
+    started = time.perf_counter()
+    for row in legacy_rows:
+        legacy_decode(row)
+    report('SELECT * -> dict + json.loads (legacy)', time.perf_counter() - started, len(legacy_rows))
+
+    for projection, rows in projected_rows.items():
+        columns = EXPERIENCE_PROJECTIONS[projection]
+        started = time.perf_counter()
+        for row in rows:
+            ExperienceRecord(columns, row)
+        report(f"'{projection}' projection -> ExperienceRecord", time.perf_counter() - started, len(rows))
+
+    print("⏱️  End-to-end lookup (connection + query + decode)")
+    for label, fetch in [
+        ('legacy SELECT * via dict', lambda unique_id: legacy_decode(
+            sqlite_row_connection(db_manager.db_url).execute(
+                'SELECT * FROM valentine_experiences WHERE unique_id = ?', (unique_id,)).fetchone())),
+        ("get_experience(projection='view')", lambda unique_id: db_manager.get_experience(unique_id, 'view')),
+        ("get_experience(projection='stats')", lambda unique_id: db_manager.get_experience(unique_id, 'stats')),
+    ]:
+        started = time.perf_counter()
+        for unique_id in lookups:
+            fetch(unique_id)
+        report(label, time.perf_counter() - started, len(lookups))
+
+    print("🧠 Memory per cached record")
+    for label, build in [
+        ('legacy dict', lambda: [legacy_decode(row) for row in legacy_rows]),
+        ("ExperienceRecord ('full')", lambda: [ExperienceRecord(EXPERIENCE_PROJECTIONS['full'], row) for row in projected_rows['full']]),
+        ("ExperienceRecord ('view')", lambda: [ExperienceRecord(EXPERIENCE_PROJECTIONS['view'], row) for row in projected_rows['view']]),
+    ]:
+        tracemalloc.start()
+        records = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"   {label:<42} {current / len(records):9.0f} bytes/record")
+        del records
+
+    conn.close()
+
+def bench_shards(args):
+    """Create and view throughput at different shard counts, with concurrent workers"""
+    from app import ShardedDatabaseManager
+
+    shard_counts = [int(count) for count in args.shard_counts.split(',')]
+    print(f"{'shards':>8} {'creates/s':>12} {'views/s':>12}")
+    for shard_count in shard_counts:
+        layout_dir = tempfile.mkdtemp(prefix=f'shards-{shard_count}-', dir=BENCH_DIR)
+        manager = ShardedDatabaseManager([os.path.join(layout_dir, f'shard{index}.db') for index in range(shard_count)])
+
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            started = time.perf_counter()
+            unique_ids = [unique_id for unique_id, _ in pool.map(
+                lambda _: manager.create_experience(dict(SAMPLE_EXPERIENCE)), range(args.rows))]
+            create_rate = args.rows / (time.perf_counter() - started)
+
+            def view(unique_id):
+                manager.get_experience(unique_id, 'view')
+                manager.increment_view_count(unique_id, '198.51.100.1', 'benchmark')
+
+            lookups = [random.choice(unique_ids) for _ in range(args.lookups)]
+            started = time.perf_counter()
+            list(pool.map(view, lookups))
+            view_rate = args.lookups / (time.perf_counter() - started)
+
+        print(f"{shard_count:>8} {create_rate:>12,.0f} {view_rate:>12,.0f}")
+
+def sample_custom_css(size_kb):
+    """Hand-written looking creator CSS of roughly `size_kb` KB (comments, indentation, some empty rules)"""
+    rules = []
+    index = 0
+    while sum(len(rule) for rule in rules) < size_kb * 1024:
+        rules.append(
+            f"/* section {index} */\n"
+            f".message-frame .line-{index} ,  .memory-text > span.word-{index} {{\n"
+            f"    color : #{index * 2654435761 % 0xffffff:06x} ;\n"
+            f"    text-shadow : 0 0 {index % 12}px rgba(255, 107, 157, 0.6) ;\n"
+            f"    transition : transform 0.{index % 9 + 1}s ease-in-out ;\n"
+            f"}}\n\n.unused-{index} {{ }}\n\n"
+        )
+        index += 1
+    return ''.join(rules)
+
+def bench_custom_css(args):
+    """Compile cost, payload size and per-view render cost: inline raw CSS vs compiled, linked stylesheet"""
+    from flask import render_template
+    from app import app, db_manager, compile_custom_css, custom_stylesheet, COLOR_PALETTES
+
+    iterations = 200
+    print(f"{'input':>8} {'raw':>9} {'compiled':>9} {'raw gz':>8} {'gz':>8} {'compile':>10} "
+          f"{'inline html':>12} {'linked html':>12} {'inline render':>14} {'linked render':>14}")
+    for size_kb in [int(size) for size in args.css_kb.split(',')]:
+        raw = sample_custom_css(size_kb)
+        app.config['CUSTOM_CSS_MAX_INPUT_BYTES'] = max(app.config['CUSTOM_CSS_MAX_INPUT_BYTES'], len(raw) + 1)
+        app.config['CUSTOM_CSS_MAX_BYTES'] = max(app.config['CUSTOM_CSS_MAX_BYTES'], len(raw) + 1)
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            compiled = compile_custom_css(raw)
+        compile_ms = (time.perf_counter() - started) / iterations * 1000
+
+        unique_id, _ = db_manager.create_experience(dict(SAMPLE_EXPERIENCE, custom_css=compiled))
+        experience = db_manager.get_experience(unique_id, 'view')
+        color_palette = COLOR_PALETTES[experience['color_palette']]
+
+        with app.test_request_context():
+            def render(inline_css, stylesheet):
+                # The pre-compilation template inlined the raw CSS in a <style> block in the head
+                page = render_template('experience.html', experience=experience, color_palette=color_palette,
+                                       unique_id=unique_id, custom_stylesheet=stylesheet)
+                return page.replace('</head>', f'<style>{inline_css}</style></head>', 1) if inline_css else page
+
+            timings = {}
+            pages = {}
+            for label, inline_css, stylesheet in [('inline', raw, None), ('linked', None, custom_stylesheet(compiled))]:
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    pages[label] = render(inline_css, stylesheet)
+                timings[label] = (time.perf_counter() - started) / iterations * 1000
+
+        print(f"{size_kb:>6}KB {len(raw):>9,} {len(compiled):>9,} {len(gzip.compress(raw.encode())):>8,} "
+              f"{len(gzip.compress(compiled.encode())):>8,} {compile_ms:>8.2f}ms "
+              f"{len(pages['inline']):>12,} {len(pages['linked']):>12,} "
+              f"{timings['inline']:>12.3f}ms {timings['linked']:>12.3f}ms")
+    print("   Linked stylesheets are immutable and cached by content hash, so repeat views download only the HTML")
+
+# Runs in a fresh interpreter, like a newly booted gunicorn worker
+WORKER_PROBE = """
+import sys, json, time
+started = time.perf_counter()
+import app as valentine
+timings = {'boot': (time.perf_counter() - started) * 1000}
+client = valentine.app.test_client()
+for label, path in json.loads(sys.argv[1]):
+    started = time.perf_counter()
+    client.get(path, headers={'X-Real-IP': '198.51.100.7'})
+    timings[label] = (time.perf_counter() - started) * 1000
+print(json.dumps(timings))
+"""
+
+def bench_first_request(args):
+    """First-request latency per freshly booted worker: source compile + reload checks vs bytecode cache + warm-up"""
+    from app import db_manager
+
+    unique_id, access_pin = db_manager.create_experience(dict(SAMPLE_EXPERIENCE))
+    paths = [
+        ('index.html', '/'),
+        ('pin_entry.html', f'/v/{unique_id}'),
+        ('experience.html', f'/v/{unique_id}?pin={access_pin}'),
+        ('error.html', '/v/missing-experience-0000'),
+    ]
+
+    warm_cache = os.path.join(BENCH_DIR, 'jinja_cache_warm')
+    os.makedirs(warm_cache, exist_ok=True)
+    modes = [
+        # Previous behaviour: TEMPLATES_AUTO_RELOAD on, every worker compiles from source
+        ('before', {'FLASK_ENV': 'development', 'TEMPLATE_WARMUP': '0'}, lambda: tempfile.mkdtemp(dir=BENCH_DIR)),
+        ('bytecode cache', {'FLASK_ENV': 'production', 'TEMPLATE_WARMUP': '0'}, lambda: warm_cache),
+        ('bytecode cache + warm-up', {'FLASK_ENV': 'production', 'TEMPLATE_WARMUP': '1'}, lambda: warm_cache),
+    ]
+
+    # Build step: fill the shared cache once, as build.sh does
+    subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manage_db.py'), 'warm-templates'],
+                   env=dict(os.environ, TEMPLATE_CACHE_DIR=warm_cache),
+                   check=True, capture_output=True)
+
+    labels = ['boot'] + [label for label, _ in paths]
+    print(f"   {'mode':<26}" + ''.join(f"{label:>17}" for label in labels))
+    for mode, mode_env, cache_dir in modes:
+        runs = []
+        for _ in range(args.workers):
+            env = dict(os.environ, TEMPLATE_CACHE_DIR=cache_dir(), **mode_env)
+            probe = subprocess.run([sys.executable, '-c', WORKER_PROBE, json.dumps(paths)],
+                                   env=env, check=True, capture_output=True, text=True)
+            runs.append(json.loads(probe.stdout.strip().splitlines()[-1]))
+        print(f"   {mode:<26}" + ''.join(f"{sum(run[label] for run in runs) / len(runs):>15.1f}ms" for label in labels))
+    print(f"   (mean of {args.workers} fresh worker processes per mode)")
+
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn',
+               'Maria', 'José', 'Aisha', 'Wei', 'Priya', 'Lucas', 'Emma', 'Noah', 'Olivia', 'Liam']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Müller', 'Okafor', 'Kowalski', 'Silva', 'Nguyen', 'Haddad']
+
+def timed_ms(operation, repeats):
+    """Median wall time of `repeats` calls, in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def bench_admin_search(args):
+    """Admin listing/search latency: full-text index + keyset pagination vs LIKE scans + OFFSET"""
+    from datetime import datetime, timedelta
+    from app import db_manager
+
+    print(f"📦 Seeding {args.rows:,} experiences...")
+    started = time.perf_counter()
+    expires_at = datetime.now() + timedelta(days=365)
+    chunk = 10000
+    for start in range(0, args.rows, chunk):
+        indexes = range(start, min(start + chunk, args.rows))
+        experiences = []
+        for index in indexes:
+            first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+            experiences.append(dict(
+                SAMPLE_EXPERIENCE,
+                creator_name=f"{first} {last}",
+                recipient_name=random.choice(FIRST_NAMES),
+                creator_email=f"{first.lower()}.{last.lower()}{index}@example.com",
+                creator_ip=f"198.51.{index % 256}.{index // 256 % 256}"
+            ))
+        db_manager.insert_experiences([f'bench-{index:08d}' for index in indexes], ['0000'] * len(experiences),
+                                      experiences, expires_at)
+    # Spread creation over a year and expire a tenth, like a live table
+    conn = sqlite3.connect(db_manager.db_url)
+    conn.execute("UPDATE valentine_experiences SET created_at = datetime('now', '-' || (abs(random()) % 31536000) || ' seconds')")
+    conn.execute("UPDATE valentine_experiences SET expires_at = datetime('now', '-1 day') WHERE id % 10 = 0")
+    conn.commit()
+    conn.execute('ANALYZE')
+    print(f"   seeded in {time.perf_counter() - started:.1f}s")
+
+    depth = args.rows // 2
+    page_size = 50
+    row = conn.execute('SELECT created_at, unique_id FROM valentine_experiences ORDER BY created_at DESC, unique_id DESC '
+                       'LIMIT 1 OFFSET ?', (depth,)).fetchone()
+    rare_email = conn.execute('SELECT creator_email FROM valentine_experiences WHERE unique_id = ?',
+                              (f"bench-{args.rows // 3:08d}",)).fetchone()[0]
+
+    searches = [
+        ('newest page', dict()),
+        (f'keyset page at row {depth:,}', dict(after=tuple(row))),
+        ('name prefix "pri pat"', dict(query='pri pat')),
+        ('e-mail address', dict(query=rare_email)),
+        ('no match "zz"', dict(query='zz')),
+        ('creator IP', dict(creator_ip='198.51.7.42')),
+        ('expired only', dict(status='expired')),
+    ]
+
+    def offset_page():
+        conn.execute('SELECT unique_id FROM valentine_experiences ORDER BY created_at DESC, unique_id DESC LIMIT ? OFFSET ?',
+                     (page_size, depth)).fetchall()
+
+    def scan(filters):
+        # Ad-hoc lookups before the index: LIKE over the three columns
+        def run():
+            db_manager.search_index = None
+            try:
+                db_manager.search_experiences(limit=page_size, **filters)
+            finally:
+                db_manager.search_index = index_kind
+        return run
+
+    index_kind = db_manager.search_index
+    print(f"   {'query':<34}{'indexed':>12}{'baseline':>12}  baseline")
+    for label, filters in searches:
+        indexed = timed_ms(lambda: db_manager.search_experiences(limit=page_size, **filters), args.repeats)
+        if 'query' in filters:
+            baseline, baseline_label = timed_ms(scan(filters), args.repeats), 'LIKE scan'
+        elif 'after' in filters:
+            baseline, baseline_label = timed_ms(offset_page, args.repeats), 'OFFSET'
+        else:
+            baseline, baseline_label = None, ''
+        baseline_text = f"{baseline:>10.2f}ms" if baseline is not None else f"{'-':>12}"
+        print(f"   {label:<34}{indexed:>10.2f}ms{baseline_text}  {baseline_label}")
+    print(f"   ({index_kind} index, median of {args.repeats} runs, {page_size} rows per page)")
+
+def sqlite_row_connection(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+BENCHMARKS = {
+    'row-decode': bench_row_decode,
+    'shards': bench_shards,
+    'custom-css': bench_custom_css,
+    'first-request': bench_first_request,
+    'admin-search': bench_admin_search,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Valentine Generator benchmarks")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--rows', type=int, default=5000, help="Experiences to seed")
+    parser.add_argument('--lookups', type=int, default=5000, help="Lookups to time")
+    parser.add_argument('--shard-counts', default='1,2,4,8', help="Shard counts to compare (shards)")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent worker threads (shards) / worker processes (first-request)")
+    parser.add_argument('--css-kb', default='4,16,60', help="Custom CSS input sizes in KB (custom-css)")
+    parser.add_argument('--repeats', type=int, default=20, help="Timed runs per query (admin-search)")
+    args = parser.parse_args()
+
+    # Per-request INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+
+    print(f"🚀 Valentine Generator - {args.benchmark} benchmark")
+    print("=" * 50)
+    try:
+        BENCHMARKS[args.benchmark](args)
+    finally:
+        # Seeded databases get large (about 1GB at a million rows)
+        shutil.rmtree(BENCH_DIR, ignore_errors=True)
+    print("=" * 50)
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,2 +1,8 @@
 #!/usr/bin/env bash
-pip install -r requirements.txt
\ No newline at end of file
+pip install -r requirements.txt
+
+# Precompute the palette x background style theme stylesheets linked by experience pages
+python manage_db.py build-themes
+
+# Precompile templates into the shared Jinja bytecode cache used by every worker
+python manage_db.py warm-templates
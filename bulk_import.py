@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Bulk Experience Import
+Create experiences from a JSONL or CSV file and write a results file of URLs and PINs
+
+Usage:
+    python bulk_import.py employees.csv results.csv --base-url https://valentine.example.com
+"""
+
+import sys
+import time
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-create Valentine experiences from JSONL or CSV")
+    parser.add_argument('input', help="Input file (.jsonl or .csv)")
+    parser.add_argument('output', help="Results file (.jsonl or .csv)")
+    parser.add_argument('--base-url', default='http://localhost:5001', help="Public base URL used for share links")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help="Input format (detected from extension by default)")
+    parser.add_argument('--chunk-size', type=int, help="Rows per insert transaction")
+    parser.add_argument('--max-rows', type=int, help="Stop after this many rows")
+    args = parser.parse_args()
+
+    from flask import url_for
+    from app import app, detect_bulk_format, iter_bulk_rows, bulk_create_experiences, format_bulk_result, BULK_RESULT_COLUMNS
+
+    input_format = detect_bulk_format(args.format, args.input)
+    output_format = detect_bulk_format(None, args.output) or input_format
+    if not input_format:
+        print(f"❌ Could not detect the format of {args.input}; pass --format jsonl|csv")
+        return False
+
+    print(f"💕 Importing {args.input} ({input_format}) -> {args.output} ({output_format})")
+    created = failed = 0
+    started = time.perf_counter()
+
+    with open(args.input, 'rb') as source, open(args.output, 'w', encoding='utf-8', newline='') as results, \
+            app.test_request_context(base_url=args.base_url):
+        if output_format == 'csv':
+            results.write(','.join(BULK_RESULT_COLUMNS) + '\r\n')
+
+        rows = iter_bulk_rows(source, input_format)
+        for result in bulk_create_experiences(rows, 'bulk_cli', 'bulk_cli', args.chunk_size, args.max_rows):
+            if result['success']:
+                result['url'] = url_for('view_experience', unique_id=result['unique_id'], _external=True)
+                created += 1
+            else:
+                failed += 1
+            results.write(format_bulk_result(result, output_format))
+
+    elapsed = time.perf_counter() - started
+    rate = created / elapsed * 60 if elapsed else 0
+    print(f"   ✅ Created: {created}")
+    print(f"   ❌ Failed:  {failed}")
+    print(f"   ⏱️  {elapsed:.1f}s ({rate:,.0f} experiences/minute)")
+    return failed == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Database Maintenance Tool
+Shard status, online resharding, expiry purges, view log retention, static bundle builds, template cache warm-up, theme stylesheets and media tiers
+
+Online reshard procedure (new shard URLs must be appended to the end of the list):
+    1. Deploy with DATABASE_SHARD_URLS_NEXT set to the new layout
+       (new experiences go to the new layout, reads fall back to the old one)
+    2. python manage_db.py reshard            # copies rows into the new layout
+    3. Deploy with DATABASE_SHARD_URLS set to the new layout and DATABASE_SHARD_URLS_NEXT unset
+    4. python manage_db.py reshard --cleanup  # deletes moved rows from their old shards
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+def split_urls(value):
+    return [url.strip() for url in (value or '').split(',') if url.strip()]
+
+def current_layout():
+    return split_urls(os.environ.get('DATABASE_SHARD_URLS')) or [os.environ.get('DATABASE_URL', 'valentine_experiences.db')]
+
+def status(args):
+    from app import DatabaseManager, shard_index
+
+    layout = split_urls(args.shards) or current_layout()
+    print(f"📊 {len(layout)} shard(s)")
+    total = 0
+    for index, url in enumerate(layout):
+        manager = DatabaseManager(url)
+        count = manager.count_experiences()
+        total += count
+
+        # Rows that do not belong here under this layout (e.g. an unfinished reshard)
+        misplaced = 0
+        after_id = 0
+        while True:
+            rows = manager.export_experience_rows(after_id, 1000)
+            if not rows:
+                break
+            after_id = rows[-1][0]
+            misplaced += sum(1 for row in rows if shard_index(row[1], len(layout)) != index)
+
+        print(f"   [{index}] {DatabaseManager.describe_target(url)}: {count} experiences, {misplaced} misplaced")
+    print(f"   Total: {total}")
+    return True
+
+def reshard(args):
+    from app import DatabaseManager, shard_index
+
+    if args.cleanup:
+        # Runs after the switch-over: the current layout is the target and the old one must be named
+        source_urls = split_urls(args.source)
+        target_urls = split_urls(args.target) or current_layout()
+    else:
+        source_urls = split_urls(args.source) or current_layout()
+        target_urls = split_urls(args.target) or split_urls(os.environ.get('DATABASE_SHARD_URLS_NEXT'))
+    if not source_urls or not target_urls:
+        print("❌ Need both a source and a target layout (--source / --target or the environment)")
+        return False
+
+    managers = {url: DatabaseManager(url) for url in dict.fromkeys(source_urls + target_urls)}
+    action = 'Cleaning up' if args.cleanup else 'Copying'
+    print(f"🔀 {action}: {len(source_urls)} -> {len(target_urls)} shard(s)")
+    started = time.perf_counter()
+    moved = 0
+
+    for source_url in source_urls:
+        source = managers[source_url]
+        after_id = 0
+        while True:
+            rows = source.export_experience_rows(after_id, args.batch_size)
+            if not rows:
+                break
+            after_id = rows[-1][0]
+
+            by_target = {}
+            for row in rows:
+                target_url = target_urls[shard_index(row[1], len(target_urls))]
+                if target_url != source_url:
+                    by_target.setdefault(target_url, []).append(row)
+
+            for target_url, target_rows in by_target.items():
+                target = managers[target_url]
+                if args.cleanup:
+                    # Only delete rows the target really has
+                    present = target.find_taken_ids({row[1] for row in target_rows})
+                    source.delete_experiences(present)
+                    moved += len(present)
+                else:
+                    moved += target.import_experience_rows(target_rows, source)
+
+        print(f"   ✅ {DatabaseManager.describe_target(source_url)} done")
+
+    verb = 'Removed' if args.cleanup else 'Copied'
+    print(f"   {verb} {moved} experiences in {time.perf_counter() - started:.1f}s")
+    return True
+
+def purge_expired(args):
+    from app import db_manager, purge_orphaned_bundles, purge_legacy_preview_cards
+
+    purged = db_manager.purge_expired_experiences()
+    print(f"🧹 Purged {purged} expired experiences")
+    dropped = db_manager.rotate_view_partitions()
+    print(f"🧹 Dropped {len(dropped)} view log partitions past retention" + (f": {', '.join(dropped)}" if dropped else ''))
+    print(f"🧹 Removed {purge_orphaned_bundles()} orphaned static bundles")
+    print(f"🧹 Removed {purge_legacy_preview_cards()} legacy per-experience preview cards")
+    return True
+
+def build_bundles(args):
+    from app import app, write_experience_bundle, CRYPTO_AVAILABLE, DatabaseManager
+
+    if not CRYPTO_AVAILABLE:
+        print("❌ Static bundles need the cryptography package")
+        return False
+
+    bundle_folder = Path(app.config['BUNDLE_FOLDER'])
+    built = skipped = 0
+    started = time.perf_counter()
+    with app.test_request_context(base_url=args.base_url):
+        for url in current_layout():
+            after_id = 0
+            while True:
+                rows = DatabaseManager(url).export_experience_rows(after_id, 500)
+                if not rows:
+                    break
+                after_id = rows[-1][0]
+                for row in rows:
+                    unique_id = row[1]
+                    if not args.rebuild and (bundle_folder / f"{unique_id}.html").exists():
+                        skipped += 1
+                    elif write_experience_bundle(unique_id):
+                        built += 1
+
+    print(f"📦 Built {built} static bundles ({skipped} already present) in {time.perf_counter() - started:.1f}s")
+    return True
+
+def warm_templates(args):
+    # Deliberately does not import app: no database init, migrations or background threads at build time
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+    cache_dir = os.environ.get('TEMPLATE_CACHE_DIR', '.jinja_cache')
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    # Same template path and autoescape rule as Flask's environment, so cache keys and compiled code match the app's
+    env = Environment(
+        loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')),
+        autoescape=select_autoescape(['html', 'htm', 'xml', 'xhtml', 'svg']),
+        bytecode_cache=FileSystemBytecodeCache(cache_dir)
+    )
+    started = time.perf_counter()
+    names = env.list_templates(extensions=['html'])
+    for name in names:
+        env.get_template(name)
+    print(f"🔥 Compiled {len(names)} templates into {cache_dir} in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return True
+
+def build_themes(args):
+    # Like warm-templates, runs at build time without importing app
+    from themes import build_theme_stylesheets
+
+    started = time.perf_counter()
+    stylesheets = build_theme_stylesheets(args.theme_dir)
+    print(f"🎨 Built {len(set(stylesheets.values()))} theme stylesheets into {args.theme_dir} in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return True
+
+def media_tiers(args):
+    from app import app, media_tiers as tiers
+
+    if args.demote:
+        if not app.config['MEDIA_TIERING']:
+            print("❌ Set MEDIA_TIERING=1 to move idle videos to the cold tier")
+            return False
+        demoted, freed = tiers.demote_idle()
+        print(f"🧊 Moved {demoted} idle videos ({freed / (1024 * 1024):.1f}MB) to {app.config['MEDIA_COLD_FOLDER']}")
+
+    tiers.refresh_tier_sizes()
+    stats = tiers.stats()
+    for tier in ('hot', 'cold'):
+        print(f"   {tier:<5} {stats[tier]['files']:>6} videos {stats[tier]['bytes'] / (1024 * 1024):>10.1f}MB")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Valentine Generator database maintenance")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    status_parser = commands.add_parser('status', help="Row counts and misplaced rows per shard")
+    status_parser.add_argument('--shards', help="Comma separated shard URLs (default: DATABASE_SHARD_URLS)")
+    status_parser.set_defaults(handler=status)
+
+    reshard_parser = commands.add_parser('reshard', help="Copy rows to a new shard layout, or clean up after one")
+    reshard_parser.add_argument('--source', help="Old layout (default: DATABASE_SHARD_URLS)")
+    reshard_parser.add_argument('--target', help="New layout (default: DATABASE_SHARD_URLS_NEXT)")
+    reshard_parser.add_argument('--batch-size', type=int, default=500)
+    reshard_parser.add_argument('--cleanup', action='store_true', help="Delete rows that now live on another shard")
+    reshard_parser.set_defaults(handler=reshard)
+
+    purge_parser = commands.add_parser('purge-expired', help="Delete expired experiences and old view partitions on every shard")
+    purge_parser.set_defaults(handler=purge_expired)
+
+    bundles_parser = commands.add_parser('build-bundles', help="Write PIN-encrypted static bundles for existing experiences")
+    bundles_parser.add_argument('--rebuild', action='store_true', help="Also rewrite bundles that already exist")
+    bundles_parser.add_argument('--base-url', default='http://localhost:5001', help="Public base URL")
+    bundles_parser.set_defaults(handler=build_bundles)
+
+    warm_parser = commands.add_parser('warm-templates', help="Compile templates into the shared Jinja bytecode cache (no app import)")
+    warm_parser.set_defaults(handler=warm_templates)
+
+    themes_parser = commands.add_parser('build-themes', help="Precompute the palette x background style theme stylesheets (no app import)")
+    themes_parser.add_argument('--theme-dir', default='themes', help="Output directory (default: themes)")
+    themes_parser.set_defaults(handler=build_themes)
+
+    media_parser = commands.add_parser('media-tiers', help="Hot/cold video storage, optionally demoting idle videos now")
+    media_parser.add_argument('--demote', action='store_true', help="Move videos idle for MEDIA_COLD_AFTER_DAYS to the cold tier")
+    media_parser.set_defaults(handler=media_tiers)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
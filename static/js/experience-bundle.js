@@ -0,0 +1,100 @@
+/**
+ * Valentine's Day Experience - Static Bundle Loader
+ * Decrypts a pre-rendered, PIN-encrypted experience in the browser
+ *
+ * @author patchyevole
+ * @github https://github.com/patchyevolve
+ */
+
+class ExperienceBundle {
+    constructor(form, bundle) {
+        this.form = form;
+        this.bundle = bundle;
+        this.uniqueId = form.action.split('/').pop();
+        this.pinInput = form.querySelector('.pin-input');
+        this.submitButton = form.querySelector('.pin-submit');
+
+        this.init();
+    }
+
+    init() {
+        if (this.bundle.expires_at && Date.now() > this.bundle.expires_at) {
+            this.showError("This Valentine's experience has expired 💔");
+            this.pinInput.disabled = true;
+            this.submitButton.disabled = true;
+            return;
+        }
+
+        this.form.addEventListener('submit', (event) => {
+            event.preventDefault();
+            this.unlock(this.pinInput.value);
+        });
+    }
+
+    async unlock(pin) {
+        if (this.unlocking) return;
+        this.unlocking = true;
+        this.submitButton.disabled = true;
+
+        try {
+            const page = await this.decrypt(pin);
+            this.show(page);
+        } catch (error) {
+            // AES-GCM authentication fails on a wrong PIN
+            this.showError('Invalid PIN. Please try again.');
+            this.pinInput.value = '';
+            this.pinInput.focus();
+        } finally {
+            this.unlocking = false;
+            this.submitButton.disabled = false;
+        }
+    }
+
+    async decrypt(pin) {
+        const encoder = new TextEncoder();
+        const material = await crypto.subtle.importKey('raw', encoder.encode(pin), 'PBKDF2', false, ['deriveKey']);
+        const key = await crypto.subtle.deriveKey(
+            { name: 'PBKDF2', salt: ExperienceBundle.decode(this.bundle.salt), iterations: this.bundle.iterations, hash: 'SHA-256' },
+            material,
+            { name: 'AES-GCM', length: 256 },
+            false,
+            ['decrypt']
+        );
+        const plaintext = await crypto.subtle.decrypt(
+            { name: 'AES-GCM', iv: ExperienceBundle.decode(this.bundle.nonce), additionalData: encoder.encode(this.uniqueId) },
+            key,
+            ExperienceBundle.decode(this.bundle.ciphertext)
+        );
+        return new TextDecoder().decode(plaintext);
+    }
+
+    show(page) {
+        // Replace the PIN page with the decrypted experience; its own scripts take over from here
+        document.open();
+        document.write(page);
+        document.close();
+    }
+
+    showError(message) {
+        let error = document.querySelector('.error-message');
+        if (!error) {
+            error = document.createElement('div');
+            error.className = 'error-message';
+            this.form.parentNode.insertBefore(error, this.form);
+        }
+        error.textContent = `⚠️ ${message}`;
+    }
+
+    static decode(base64) {
+        return Uint8Array.from(atob(base64), char => char.charCodeAt(0));
+    }
+}
+
+// Without WebCrypto (e.g. plain HTTP) the form falls back to server-side PIN checks
+document.addEventListener('DOMContentLoaded', () => {
+    const form = document.querySelector('form[data-bundle]');
+    const data = document.getElementById('experience-bundle');
+    if (form && data && window.crypto && crypto.subtle) {
+        window.experienceBundle = new ExperienceBundle(form, JSON.parse(data.textContent));
+    }
+});
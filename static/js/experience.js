@@ -15,7 +15,6 @@ class ValentineExperience {
         this.experienceData = window.EXPERIENCE_DATA || {};
         
         // Initialize enhancement managers (with fallbacks)
-        this.colorManager = window.ColorGradientManager ? new ColorGradientManager() : null;
         this.particleManager = window.ParticleSystemManager ? new ParticleSystemManager() : null;
         this.svgManager = window.SVGAnimationManager ? new SVGAnimationManager() : null;
         this.typographyManager = window.TypographyManager ? new TypographyManager() : null;
@@ -27,6 +26,7 @@ class ValentineExperience {
         try {
             this.cacheElements();
             this.setupEventListeners();
+            this.recordView();
             
             // Initialize enhancements immediately
             this.initializeEnhancements();
@@ -617,6 +617,22 @@ class ValentineExperience {
         this.announcements.textContent = announcements[stateName] || '';
     }
     
+    recordView() {
+        // Static bundles are served without touching the server, so they report their view here
+        const beacon = this.experienceData.view_beacon;
+        if (!beacon) return;
+        
+        try {
+            if (!(navigator.sendBeacon && navigator.sendBeacon(beacon.url, beacon.token))) {
+                fetch(beacon.url, { method: 'POST', body: beacon.token, keepalive: true }).catch(error => {
+                    console.warn('View beacon failed:', error);
+                });
+            }
+        } catch (error) {
+            console.warn('View beacon error:', error);
+        }
+    }
+    
     trackEvent(category, action) {
         try {
             // Send analytics event to server
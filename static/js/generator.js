@@ -583,8 +583,13 @@ class ValentineGenerator {
             this.isSubmitting = true;
             this.showLoading(true);
             
-            // Prepare form data
+            // Prepare form data - the video goes last so the server validates the fields before it streams in
             const formData = new FormData(this.form);
+            const videoFile = formData.get('video_file');
+            if (videoFile) {
+                formData.delete('video_file');
+                formData.append('video_file', videoFile);
+            }
             
             // Submit to server
             const response = await fetch('/create', {
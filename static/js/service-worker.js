@@ -0,0 +1,203 @@
+/**
+ * Valentine's Day Experience - Service Worker
+ * Makes repeat opens of an experience instant and available offline
+ *
+ * ASSET_VERSION and PRECACHE_URLS are prepended by the /sw.js route from the static asset
+ * manifest, so every deploy that changes an asset installs a new worker with fresh caches.
+ *
+ * @author patchyevole
+ * @github https://github.com/patchyevolve
+ */
+
+const STATIC_CACHE = `valentine-static-${ASSET_VERSION}`;
+const PAGE_CACHE = `valentine-pages-${ASSET_VERSION}`;
+const FONT_CACHE = 'valentine-fonts-v1';
+const MEDIA_CACHE = 'valentine-media-v1';  // Uploaded media never changes, so it survives deploys
+const CURRENT_CACHES = [STATIC_CACHE, PAGE_CACHE, FONT_CACHE, MEDIA_CACHE];
+const FONT_HOSTS = ['fonts.googleapis.com', 'fonts.gstatic.com'];
+
+// Least recently played videos are evicted past either cap; the index records last use and size
+const MEDIA_MAX_ENTRIES = 10;
+const MEDIA_MAX_BYTES = 300 * 1024 * 1024;
+const MEDIA_INDEX_URL = '/__media-index__';
+
+let mediaIndexUpdates = Promise.resolve();
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(STATIC_CACHE)
+            .then(cache => cache.addAll(PRECACHE_URLS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    // Drop caches from previous deploys
+    event.waitUntil(
+        caches.keys()
+            .then(names => Promise.all(
+                names
+                    .filter(name => name.startsWith('valentine-') && !CURRENT_CACHES.includes(name))
+                    .map(name => caches.delete(name))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin === self.location.origin) {
+        if (['/static/', '/custom-css/', '/themes/'].some(prefix => url.pathname.startsWith(prefix))) {
+            event.respondWith(cacheFirst(request, STATIC_CACHE));
+        } else if (url.pathname.startsWith('/uploads/')) {
+            event.respondWith(serveMedia(event));
+        } else if (request.mode === 'navigate' && url.pathname.startsWith('/v/')) {
+            event.respondWith(staleWhileRevalidate(event, PAGE_CACHE));
+        }
+    } else if (FONT_HOSTS.includes(url.hostname)) {
+        event.respondWith(staleWhileRevalidate(event, FONT_CACHE));
+    }
+});
+
+async function cacheFirst(request, cacheName) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request);
+    if (cached) return cached;
+
+    const response = await fetch(request);
+    if (response.ok) {
+        cache.put(request, response.clone());
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event, cacheName) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(event.request);
+
+    const network = fetch(event.request).then((response) => {
+        if (isCacheable(response)) {
+            cache.put(event.request, response.clone());
+        } else if (response.status === 404 || response.status === 410) {
+            // Expired or removed experiences stop opening offline too
+            cache.delete(event.request);
+        }
+        return response;
+    });
+
+    if (cached) {
+        event.waitUntil(network.catch(() => {}));
+        return cached;
+    }
+    return network;
+}
+
+function isCacheable(response) {
+    // Wrong-PIN pages and errors are never kept; opaque (cross-origin font) responses are
+    if (response.type === 'opaque') return true;
+    return response.status === 200 && !/no-store/.test(response.headers.get('Cache-Control') || '');
+}
+
+async function serveMedia(event) {
+    const request = event.request;
+    const cache = await caches.open(MEDIA_CACHE);
+    const cached = await cache.match(request.url);
+    if (cached) {
+        event.waitUntil(updateMediaIndex(cache, index => { index[request.url].used = Date.now(); }));
+        return rangeResponse(request, cached);
+    }
+
+    // First play streams from the server as usual. If that response covers the whole file, a copy of
+    // the same stream is stored once the player has read all of it, so nothing is downloaded twice.
+    const response = await fetch(request);
+    if (isCompleteMedia(response)) {
+        event.waitUntil(
+            storeMedia(cache, request.url, response.clone())
+                .catch(error => console.warn('Media caching skipped:', error))
+        );
+    }
+    return response;
+}
+
+function isCompleteMedia(response) {
+    if (response.status === 200) return true;
+    const range = /^bytes 0-(\d+)\/(\d+)$/.exec(response.headers.get('Content-Range') || '');
+    return response.status === 206 && range !== null && Number(range[1]) + 1 === Number(range[2]);
+}
+
+async function storeMedia(cache, url, response) {
+    // Rejects if the player abandons the stream (seek, navigation), leaving nothing half-stored
+    const blob = await response.blob();
+    if (blob.size > MEDIA_MAX_BYTES) return;
+
+    await cache.put(url, new Response(blob, {
+        headers: {
+            'Content-Type': response.headers.get('Content-Type') || 'video/mp4',
+            'Content-Length': String(blob.size)
+        }
+    }));
+    await updateMediaIndex(cache, (index) => { index[url] = { used: Date.now(), size: blob.size }; });
+}
+
+function updateMediaIndex(cache, change) {
+    // Serialized so concurrent plays do not overwrite each other's index updates
+    mediaIndexUpdates = mediaIndexUpdates
+        .then(async () => {
+            const stored = await cache.match(MEDIA_INDEX_URL);
+            const index = stored ? await stored.json() : {};
+            const urls = (await cache.keys()).map(key => key.url).filter(url => !url.endsWith(MEDIA_INDEX_URL));
+            for (const url of urls) {
+                index[url] = index[url] || { used: 0, size: 0 };  // Stored by an older worker
+            }
+            change(index);
+
+            // Evict least recently used videos until both caps are met
+            let entries = urls.map(url => [url, index[url]]).sort((a, b) => a[1].used - b[1].used);
+            let total = entries.reduce((sum, [, entry]) => sum + entry.size, 0);
+            while (entries.length > MEDIA_MAX_ENTRIES || (entries.length > 1 && total > MEDIA_MAX_BYTES)) {
+                const [url, entry] = entries.shift();
+                await cache.delete(url);
+                total -= entry.size;
+            }
+
+            const kept = Object.fromEntries(entries);
+            await cache.put(MEDIA_INDEX_URL, new Response(JSON.stringify(kept), {
+                headers: { 'Content-Type': 'application/json' }
+            }));
+        })
+        .catch(error => console.warn('Media cache index update failed:', error));
+    return mediaIndexUpdates;
+}
+
+async function rangeResponse(request, cached) {
+    // <video> asks for byte ranges; answer them from the cached full file
+    const range = /^bytes=(\d*)-(\d*)$/.exec(request.headers.get('Range') || '');
+    if (!range) return cached;
+
+    const blob = await cached.blob();
+    let start;
+    let end;
+    if (range[1] === '') {
+        start = Math.max(blob.size - Number(range[2]), 0);
+        end = blob.size - 1;
+    } else {
+        start = Number(range[1]);
+        end = range[2] === '' ? blob.size - 1 : Math.min(Number(range[2]), blob.size - 1);
+    }
+
+    if (start >= blob.size || start > end) {
+        return new Response(null, { status: 416, headers: { 'Content-Range': `bytes */${blob.size}` } });
+    }
+    return new Response(blob.slice(start, end + 1), {
+        status: 206,
+        headers: {
+            'Content-Type': cached.headers.get('Content-Type') || 'video/mp4',
+            'Content-Range': `bytes ${start}-${end}/${blob.size}`,
+            'Content-Length': String(end - start + 1),
+            'Accept-Ranges': 'bytes'
+        }
+    });
+}
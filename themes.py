@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Color palettes, background styles and the precomputed theme stylesheets built from them
+Imported by the app and by build-time tooling, so importing it has no side effects
+"""
+
+import os
+import re
+import json
+import time
+import secrets
+import hashlib
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Color palettes and themes
+COLOR_PALETTES = {
+    'romantic_pink': {
+        'name': 'Romantic Pink',
+        'primary': '#ff6b9d',
+        'secondary': '#fd79a8',
+        'accent': '#fdcb6e',
+        'background': 'linear-gradient(135deg, #ff9a9e 0%, #fecfef 50%, #fecfef 100%)',
+        'description': 'Classic romantic pink with warm tones'
+    },
+    'sunset_orange': {
+        'name': 'Sunset Orange',
+        'primary': '#ff7675',
+        'secondary': '#fd79a8',
+        'accent': '#fdcb6e',
+        'background': 'linear-gradient(135deg, #ff9a56 0%, #ff6b9d 50%, #c44569 100%)',
+        'description': 'Warm sunset colors with orange and pink'
+    },
+    'purple_dream': {
+        'name': 'Purple Dream',
+        'primary': '#a29bfe',
+        'secondary': '#6c5ce7',
+        'accent': '#fd79a8',
+        'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 50%, #a29bfe 100%)',
+        'description': 'Dreamy purple with mystical vibes'
+    },
+    'ocean_blue': {
+        'name': 'Ocean Blue',
+        'primary': '#74b9ff',
+        'secondary': '#0984e3',
+        'accent': '#00cec9',
+        'background': 'linear-gradient(135deg, #74b9ff 0%, #0984e3 50%, #00cec9 100%)',
+        'description': 'Calming ocean blues and teals'
+    },
+    'forest_green': {
+        'name': 'Forest Green',
+        'primary': '#00b894',
+        'secondary': '#00a085',
+        'accent': '#55a3ff',
+        'background': 'linear-gradient(135deg, #00b894 0%, #55a3ff 50%, #667eea 100%)',
+        'description': 'Natural forest greens with sky blue'
+    },
+    'golden_hour': {
+        'name': 'Golden Hour',
+        'primary': '#fdcb6e',
+        'secondary': '#f39c12',
+        'accent': '#ff7675',
+        'background': 'linear-gradient(135deg, #fdcb6e 0%, #f39c12 50%, #ff7675 100%)',
+        'description': 'Warm golden tones like sunset'
+    },
+    
+    # NEW ENHANCED GRADIENTS
+    'neon_cyberpunk': {
+        'name': 'Neon Cyberpunk',
+        'primary': '#ff0080',
+        'secondary': '#00ffff',
+        'accent': '#ff4081',
+        'background': 'linear-gradient(135deg, #ff0080 0%, #7928ca 30%, #00ffff 70%, #ff4081 100%)',
+        'description': 'Electric neon colors with cyberpunk vibes'
+    },
+    'pastel_rainbow': {
+        'name': 'Pastel Rainbow',
+        'primary': '#ffeaa7',
+        'secondary': '#fab1a0',
+        'accent': '#fd79a8',
+        'background': 'linear-gradient(135deg, #ffeaa7 0%, #fab1a0 25%, #fd79a8 50%, #a29bfe 75%, #74b9ff 100%)',
+        'description': 'Soft pastel rainbow with dreamy colors'
+    },
+    'dark_gothic': {
+        'name': 'Dark Gothic',
+        'primary': '#2d3436',
+        'secondary': '#636e72',
+        'accent': '#e17055',
+        'background': 'linear-gradient(135deg, #2d3436 0%, #636e72 50%, #e17055 100%)',
+        'description': 'Dark romantic with gothic elegance'
+    },
+    'metallic_gold': {
+        'name': 'Metallic Gold',
+        'primary': '#f39c12',
+        'secondary': '#d35400',
+        'accent': '#fdcb6e',
+        'background': 'linear-gradient(135deg, #f39c12 0%, #d35400 30%, #fdcb6e 70%, #f1c40f 100%)',
+        'description': 'Luxurious metallic gold with bronze'
+    },
+    'rose_gold': {
+        'name': 'Rose Gold',
+        'primary': '#e84393',
+        'secondary': '#fd79a8',
+        'accent': '#fdcb6e',
+        'background': 'linear-gradient(135deg, #e84393 0%, #fd79a8 40%, #fdcb6e 80%, #f39c12 100%)',
+        'description': 'Elegant rose gold with warm tones'
+    },
+    'cherry_blossom': {
+        'name': 'Cherry Blossom',
+        'primary': '#fd79a8',
+        'secondary': '#fdcb6e',
+        'accent': '#fab1a0',
+        'background': 'linear-gradient(135deg, #fd79a8 0%, #fdcb6e 30%, #fab1a0 70%, #ffeaa7 100%)',
+        'description': 'Soft cherry blossom pink and cream'
+    },
+    'midnight_aurora': {
+        'name': 'Midnight Aurora',
+        'primary': '#00b894',
+        'secondary': '#00cec9',
+        'accent': '#a29bfe',
+        'background': 'linear-gradient(135deg, #2d3436 0%, #00b894 30%, #00cec9 60%, #a29bfe 100%)',
+        'description': 'Northern lights over midnight sky'
+    }
+}
+
+BACKGROUND_STYLES = {
+    'cloudy': {
+        'name': 'Soft Clouds',
+        'description': 'Gentle floating clouds with soft edges'
+    },
+    'particles': {
+        'name': 'Floating Particles',
+        'description': 'Magical floating particles and sparkles'
+    },
+    'geometric': {
+        'name': 'Geometric Patterns',
+        'description': 'Modern geometric shapes and patterns'
+    },
+    'minimal': {
+        'name': 'Minimal Clean',
+        'description': 'Clean and minimal background'
+    },
+    
+    # ENHANCED PARTICLE BACKGROUNDS
+    'hearts': {
+        'name': 'Heart Rain',
+        'description': 'Falling animated hearts'
+    },
+    'stars': {
+        'name': 'Starfield',
+        'description': 'Twinkling stars with depth'
+    },
+    'petals': {
+        'name': 'Rose Petals',
+        'description': 'Floating rose petals'
+    },
+    'fireflies': {
+        'name': 'Fireflies',
+        'description': 'Glowing dots with trails'
+    },
+    'bubbles': {
+        'name': 'Bubbles',
+        'description': 'Floating soap bubbles'
+    }
+}
+
+# Background style rules, split per style into the theme stylesheets
+BACKGROUND_CSS_SOURCE = Path(__file__).resolve().parent / 'static' / 'css' / 'backgrounds.css'
+
+def split_css_rules(css):
+    """Top-level rules of a stylesheet, with at-rules keeping their nested blocks"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    rules, depth, start = [], 0, 0
+    for match in re.finditer(r'[{}]', css):
+        if match.group() == '{':
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                rules.append(css[start:match.end()].strip())
+                start = match.end()
+    return rules
+
+def background_style_rules(rules, style_key):
+    """Rules for one background style plus the keyframes they animate with"""
+    selector = re.compile(rf'\.background-{re.escape(style_key)}(?![-\w])')
+    selected = [rule for rule in rules if not rule.startswith('@') and selector.search(rule.split('{', 1)[0])]
+    animations = {name for rule in selected for name in re.findall(r'animation(?:-name)?\s*:\s*([-\w]+)', rule)}
+    keyframes = [rule for rule in rules
+                 if (match := re.match(r'@keyframes\s+([-\w]+)', rule)) and match.group(1) in animations]
+    return selected + keyframes
+
+def palette_stylesheet(palette):
+    """Theme variables of a palette, as the experience page used to inline them"""
+    return (
+        f"/* {palette['name']} */\n"
+        f":root {{\n"
+        f"    --primary-color: {palette['primary']};\n"
+        f"    --secondary-color: {palette['secondary']};\n"
+        f"    --accent-color: {palette['accent']};\n"
+        f"    --background-gradient: {palette['background']};\n"
+        f"}}\n"
+    )
+
+def theme_source_hash():
+    """Hash of everything the theme stylesheets are generated from"""
+    source = json.dumps([COLOR_PALETTES, sorted(BACKGROUND_STYLES)], sort_keys=True)
+    source += BACKGROUND_CSS_SOURCE.read_text(encoding='utf-8')
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+
+def write_theme_stylesheet(theme_dir, name, css):
+    """Write a content-hashed theme stylesheet (files are never rewritten, so old pages keep working)"""
+    filename = f"{name}.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]}.css"
+    stylesheet_path = Path(theme_dir) / filename
+    if not stylesheet_path.exists():
+        temp_path = stylesheet_path.with_suffix(f'.{secrets.token_hex(4)}.tmp')
+        temp_path.write_text(css, encoding='utf-8')
+        os.replace(temp_path, stylesheet_path)
+    return filename
+
+def build_theme_stylesheets(theme_dir='themes'):
+    """Generate one stylesheet per palette and per palette x background style, plus their manifest"""
+    started = time.perf_counter()
+    theme_dir = Path(theme_dir)
+    theme_dir.mkdir(parents=True, exist_ok=True)
+
+    rules = split_css_rules(BACKGROUND_CSS_SOURCE.read_text(encoding='utf-8'))
+    style_css = {key: '\n\n'.join(background_style_rules(rules, key)) for key in BACKGROUND_STYLES}
+
+    stylesheets = {}
+    for palette_key, palette in COLOR_PALETTES.items():
+        palette_css = palette_stylesheet(palette)
+        stylesheets[palette_key] = write_theme_stylesheet(theme_dir, palette_key, palette_css)
+        for style_key, css in style_css.items():
+            # Styles drawn entirely by JS (hearts, stars, svg_*) share the palette-only file
+            stylesheets[f'{palette_key}/{style_key}'] = (
+                write_theme_stylesheet(theme_dir, f'{palette_key}.{style_key}', f"{palette_css}\n{css}\n")
+                if css else stylesheets[palette_key]
+            )
+
+    manifest_path = theme_dir / 'manifest.json'
+    temp_path = manifest_path.with_suffix(f'.{secrets.token_hex(4)}.tmp')
+    temp_path.write_text(json.dumps({'source': theme_source_hash(), 'stylesheets': stylesheets}, indent=2, sort_keys=True),
+                         encoding='utf-8')
+    os.replace(temp_path, manifest_path)
+
+    logger.info(f"Built {len(set(stylesheets.values()))} theme stylesheets in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return stylesheets
+
+def load_theme_stylesheets(theme_dir='themes'):
+    """Theme manifest written by the build step, rebuilt when palettes or background styles changed"""
+    manifest_path = Path(theme_dir) / 'manifest.json'
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        if manifest.get('source') == theme_source_hash():
+            return manifest['stylesheets']
+    except (OSError, ValueError, KeyError):
+        pass
+    return build_theme_stylesheets(theme_dir)
@@ -4,8 +4,67 @@ Deployment Verification Script
 Quick check to ensure the app is ready for production deployment
 """
 
+import io
 import os
 import sys
+import subprocess
+import tempfile
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+def run_scratch_command(scratch, *args, **env):
+    """Run a manage_db.py command with its working files (databases, bundles, uploads) inside `scratch`"""
+    command_env = {key: value for key, value in os.environ.items()
+                   if not key.startswith('DATABASE_')}
+    command_env.update(env)
+    return subprocess.run(
+        [sys.executable, str(SCRIPT_DIR / 'manage_db.py'), *args],
+        cwd=scratch, env=command_env, capture_output=True, text=True, timeout=300
+    )
+
+class CountingBody(io.RawIOBase):
+    """A large multipart /create body generated on demand, counting how much of it the app reads"""
+
+    def __init__(self, head, video_bytes, tail):
+        super().__init__()
+        self.parts = [head, video_bytes, tail]
+        self.length = len(head) + video_bytes + len(tail)
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self.position = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.length}[whence] + offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def readinto(self, buffer):
+        chunk = self.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+    def read(self, size=-1):
+        head, video_bytes, tail = self.parts
+        size = self.length - self.position if size is None or size < 0 else min(size, self.length - self.position)
+        chunk = bytearray()
+        while len(chunk) < size:
+            offset = self.position + len(chunk)
+            if offset < len(head):
+                chunk += head[offset:offset + size - len(chunk)]
+            elif offset < len(head) + video_bytes:
+                chunk += b'\0' * min(size - len(chunk), len(head) + video_bytes - offset)
+            else:
+                offset -= len(head) + video_bytes
+                chunk += tail[offset:offset + size - len(chunk)]
+        self.position += len(chunk)
+        return bytes(chunk)
 
 def main():
     print("🚀 Valentine Generator - Deployment Verification")
@@ -51,6 +110,72 @@ def main():
         print(f"   ❌ Route test failed: {e}")
         return False
     
+    # Test 5: Sharded maintenance
+    print("5. Testing purge-expired on two scratch shards...")
+    try:
+        with tempfile.TemporaryDirectory() as scratch:
+            orphan = Path(scratch, 'experiences', 'sweet-heart-0001.html')
+            orphan.parent.mkdir()
+            orphan.write_text('<html></html>')
+            result = run_scratch_command(
+                scratch, 'purge-expired',
+                DATABASE_SHARD_URLS=f"{scratch}/shard0.db,{scratch}/shard1.db"
+            )
+            if result.returncode != 0:
+                print(f"   ❌ purge-expired failed: {result.stderr.strip().splitlines()[-1:]}")
+                return False
+            if orphan.exists():
+                print("   ❌ Orphaned static bundle was not removed")
+                return False
+        print("   ✅ Sharded purge-expired working")
+    except Exception as e:
+        print(f"   ❌ Sharded maintenance test failed: {e}")
+        return False
+    
+    # Test 6: Custom CSS compiler
+    print("6. Testing custom CSS compilation...")
+    try:
+        from app import compile_custom_css
+        cases = {
+            '.a { background: url("data:image/png;base64,AAA{}") }': '.a{background:url("data:image/png;base64,AAA{}")}',
+            '.b { content: ";}" } .c { }': '.b{content:";}"}',
+            '@media (max-width: 10px) { .d { } }': '',
+        }
+        for source, expected in cases.items():
+            compiled = compile_custom_css(source)
+            if compiled != expected:
+                print(f"   ❌ {source!r} compiled to {compiled!r}, expected {expected!r}")
+                return False
+        print("   ✅ Custom CSS compiler working")
+    except Exception as e:
+        print(f"   ❌ Custom CSS test failed: {e}")
+        return False
+    
+    # Test 7: Early upload rejection
+    print("7. Testing that a blank required field is rejected before the video is read...")
+    try:
+        boundary = 'verify-boundary'
+        fields = {'creator_name': '', 'recipient_name': 'Sam', 'personal_message': 'Happy Valentine\'s Day!'}
+        head = ''.join(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            for name, value in fields.items()
+        ) + (f'--{boundary}\r\nContent-Disposition: form-data; name="video_file"; filename="clip.mp4"\r\n'
+             'Content-Type: video/mp4\r\n\r\n\0\0\0\x18ftypmp42')
+        body = CountingBody(head.encode(), 20 * 1024 * 1024, f'\r\n--{boundary}--\r\n'.encode())
+        with app.test_client() as client:
+            response = client.post('/create', input_stream=body, content_length=body.length,
+                                   content_type=f'multipart/form-data; boundary={boundary}')
+        if response.status_code != 400 or 'creator_name' not in response.get_json().get('error', ''):
+            print(f"   ❌ Expected a 400 for the blank creator_name, got {response.status_code}")
+            return False
+        if body.position > 256 * 1024:
+            print(f"   ❌ Read {body.position:,} of {body.length:,} bytes before rejecting")
+            return False
+        print(f"   ✅ Rejected after reading {body.position:,} of {body.length:,} bytes")
+    except Exception as e:
+        print(f"   ❌ Early rejection test failed: {e}")
+        return False
+    
     print("=" * 50)
     print("🎉 All checks passed! Ready for deployment.")
     return True